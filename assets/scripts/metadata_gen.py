@@ -1,73 +1,161 @@
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 
 from mutagen.flac import FLAC
 from pathlib import Path
 from ulid import ULID
+import argparse
+import os
 import re
+import time
 import warnings
 import json
 
 from src.interactor.core.config import Settings
+from src.interactor.media.flac_header import open_flac
+
+EXAMPLE_DIR = 'ARTIST - ALBUM (YEAR)'
+
+@dataclass
+class GenReport:
+    written: int = 0
+    skipped: int = 0  # incremental mode, FLACs unchanged since the last run
+    failed: int = 0
+    tracks: int = 0
+    elapsed_s: float = 0.0
+    failures: list[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        total = self.written + self.skipped + self.failed
+        rate = total / self.elapsed_s if self.elapsed_s else 0.0
+        lines = [f"{total} albums in {self.elapsed_s:.2f} s ({rate:.1f} albums/s, {self.tracks} tracks read): "
+                 f"{self.written} written, {self.skipped} unchanged, {self.failed} failed"]
+        lines += [f"  failed: {f}" for f in self.failures]
+        return "\n".join(lines)
+
+def run_gen(root: Path | None = None, jobs: int = 1, incremental: bool = False) -> GenReport:
+    """
+    Write album.json for every album folder under `root` (the assets_dir from settings.local.toml
+    by default). Existing album_ids are kept. With `incremental`, albums whose FLACs have the same
+    mtimes and sizes as recorded in album.json are left alone. `jobs` > 1 uses a process pool.
+    """
+    t0 = time.perf_counter()
+    root = Path(root) if root else Path(Settings.from_file('settings.local.toml').assets_dir)
+    folders = [f for f in sorted(root.iterdir()) if f.is_dir() and f.name != EXAMPLE_DIR]
+
+    report = GenReport()
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(gen_album, f, incremental) for f in folders]
+            for fut in as_completed(futures):
+                _tally(report, *fut.result())
+    else:
+        for f in folders:
+            _tally(report, *gen_album(f, incremental))
+
+    report.elapsed_s = time.perf_counter() - t0
+    return report
+
+def _tally(report: GenReport, folder: Path, status: str, tracks: int, detail: str) -> None:
+    report.tracks += tracks
+    if status == 'written':
+        report.written += 1
+    elif status == 'skipped':
+        report.skipped += 1
+    elif status == 'failed':
+        report.failed += 1
+        report.failures.append(f"{folder.name}: {detail}")
+
+def gen_album(subfolder: Path, incremental: bool = False) -> tuple[Path, str, int, str]:
+    """
+    Generate one album.json. Returns (folder, status, tracks read, detail) where status is
+    written / skipped / ignored / failed. Runs in pool workers, so it never raises.
+    """
+    try:
+        return _gen_album(subfolder, incremental)
+    except Exception as e:
+        return subfolder, 'failed', 0, repr(e)
 
-rootdir = Path(Settings.from_file('settings.local.toml').assets_dir)
-
-def run_gen():
-    for subfolder in rootdir.iterdir():
-        if subfolder.is_dir():
-            # Ignore the example folder
-            if subfolder.name == 'ARTIST - ALBUM (YEAR)':
-                continue
-
-            folder_name = str(subfolder.name)
-            try:
-                folder_name = _split_name(folder_name)
-            except ValueError:
-                continue
-
-            # Generate album data
-            album = {
-                "album_id": str(ULID()),
-                "album_title": folder_name[1],
-                "album_artist": folder_name[0],
-                "release_year": folder_name[2],
-                "disc_total": 1,
-                "track_total": 1,
-                "tracks": [],
-                "alt_art": _find_alt_artwork(subfolder)
+def _gen_album(subfolder: Path, incremental: bool) -> tuple[Path, str, int, str]:
+    folder_name = str(subfolder.name)
+    try:
+        folder_name = _split_name(folder_name)
+    except ValueError:
+        return subfolder, 'ignored', 0, ''
+
+    full_path = subfolder / 'album.json'
+    previous = _read_previous(full_path)
+
+    flacs = sorted(f for f in subfolder.iterdir() if f.is_file() and f.suffix == '.flac')
+    source = _fingerprint(flacs)
+    if incremental and previous and previous.get('source') == source:
+        return subfolder, 'skipped', 0, ''
+
+    # Generate album data, keeping the album's identity across runs
+    album = {
+        "album_id": (previous or {}).get('album_id') or str(ULID()),
+        "album_title": folder_name[1],
+        "album_artist": folder_name[0],
+        "release_year": folder_name[2],
+        "disc_total": 1,
+        "track_total": 1,
+        "tracks": [],
+        "alt_art": _find_alt_artwork(subfolder),
+        "source": source,
+    }
+
+    for file in flacs:
+        # Just the tag and STREAMINFO blocks, embedded art is skipped over
+        audio = open_flac(file)
+
+        try:
+            track = {
+                "track_title": audio["TITLE"][0],
+                "track_artist": _delim_to_arr(audio["ARTIST"][0]),
+                "composer": _delim_to_arr(_safe_tag(audio, "COMPOSER")),
+                "lyricist": _delim_to_arr(_safe_tag(audio, "LYRICIST")),
+                "disc": int(audio["DISCNUMBER"][0].split("/")[0]),
+                "track": int(audio["TRACKNUMBER"][0].split("/")[0]),
+                "isrc": audio["ISRC"][0],
+                "copyright": audio["COPYRIGHT"][0],
+                "release_date": audio["DATE"][0],
+                "duration": audio.info.length,
+                "explicit": _explicit_flag(audio),
+                "lyrics": file.with_suffix('.lrc').name.replace('\\', '/'),
+                "alt_art_track": album['alt_art'].get(file.stem, []) if album['alt_art'] else []
             }
+        except Exception as e:
+            warnings.warn(f"Issue with {file.name}: {e}")
+            continue
+
+        album["tracks"].append(track)
+
+    if not album["tracks"]:
+        return subfolder, 'failed', len(flacs), 'no readable tracks'
 
-            for file in subfolder.iterdir():
-                if file.is_file() and file.suffix == '.flac':
-                    audio = FLAC(file)
-
-                    try:
-                        track = {
-                            "track_title": audio["TITLE"][0],
-                            "track_artist": _delim_to_arr(audio["ARTIST"][0]),
-                            "composer": _delim_to_arr(_safe_tag(audio, "COMPOSER")),
-                            "lyricist": _delim_to_arr(_safe_tag(audio, "LYRICIST")),
-                            "disc": int(audio["DISCNUMBER"][0].split("/")[0]),
-                            "track": int(audio["TRACKNUMBER"][0].split("/")[0]),
-                            "isrc": audio["ISRC"][0],
-                            "copyright": audio["COPYRIGHT"][0],
-                            "release_date": audio["DATE"][0],
-                            "duration": audio.info.length,
-                            "explicit": _explicit_flag(audio),
-                            "lyrics": file.with_suffix('.lrc').name.replace('\\', '/'),
-                            "alt_art_track": album['alt_art'].get(file.stem, []) if album['alt_art'] else []
-                        }
-                    except Exception as e:
-                        warnings.warn(f"Issue with {file.name}: {e}")
-
-                    album["tracks"].append(track)
-
-            # Final additions are based off last song (for simplicity)
-            last_track = album["tracks"][-1]
-            album["disc_total"] = last_track["disc"]
-            album["track_total"] = last_track["track"]
-
-            full_path = subfolder / 'album.json'
-            full_path.write_text(json.dumps(album, indent=4, ensure_ascii=False), encoding="utf-8")
+    # Final additions are based off last song (for simplicity)
+    last_track = max(album["tracks"], key=lambda t: (t["disc"], t["track"]))
+    album["disc_total"] = last_track["disc"]
+    album["track_total"] = last_track["track"]
+
+    full_path.write_text(json.dumps(album, indent=4, ensure_ascii=False), encoding="utf-8")
+    return subfolder, 'written', len(flacs), ''
+
+def _read_previous(path: Path) -> dict | None:
+    """ The album.json from the last run, if there is a readable one. """
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def _fingerprint(flacs: list[Path]) -> dict[str, list[int]]:
+    """ {file name: [mtime_ns, size]} of the album's FLACs, stored in album.json as "source". """
+    out = {}
+    for f in flacs:
+        st = f.stat()
+        out[f.name] = [st.st_mtime_ns, st.st_size]
+    return out
 
 def _split_name(subfolder: str) -> tuple[str, str, str]:
     """
@@ -115,7 +203,8 @@ def _explicit_flag(track: FLAC) -> int:
         if track["RATING"][0] == "Explicit":
             return 1
     except KeyError:
-        return 0
+        pass
+    return 0
 
 def _find_alt_artwork(folder: Path) -> dict | None:
     """ Grabs all alternate artwork files for an album (like animated covers). """
@@ -135,9 +224,14 @@ def _find_alt_artwork(folder: Path) -> dict | None:
 
     return dict(all_art)
 
+def main():
+    ap = argparse.ArgumentParser(description="Generate album.json files from FLAC tags")
+    ap.add_argument("--root", type=Path, default=None, help="library folder (default: assets_dir in settings.local.toml)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes, 1 runs serially")
+    ap.add_argument("--incremental", action="store_true", help="skip albums whose FLACs haven't changed")
+    args = ap.parse_args()
+
+    print(run_gen(args.root, jobs=max(1, args.jobs), incremental=args.incremental))
+
 if __name__ == '__main__':
-    run_gen()
-    """
-    audio = FLAC('../library/Brent Faiyaz - Fuck The World (2020)/01. Brent Faiyaz - Skyline.flac')
-    print(audio.pprint())
-    """
\ No newline at end of file
+    main()
@@ -1,2 +1,3 @@
 from .input import RealTimeAudioCapture
+from .fanout import BackpressurePolicy
 from .protocols import AudioInput
\ No newline at end of file
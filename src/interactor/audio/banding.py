@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from enum import StrEnum
+from functools import lru_cache
+
+import numpy as np
+from numpy.fft import rfftfreq
+
+class BandScale(StrEnum):
+    LOG = "log"
+    MEL = "mel"
+    BARK = "bark"
+
+def hz_to_scale(f: np.ndarray | float, scale: BandScale | str) -> np.ndarray:
+    f = np.asarray(f, dtype=np.float64)
+    scale = BandScale(scale)
+    if scale is BandScale.MEL:
+        return 2595.0 * np.log10(1.0 + f / 700.0)
+    if scale is BandScale.BARK:
+        # Traunmüller (1990)
+        return 26.81 * f / (1960.0 + f) - 0.53
+    return np.log10(f)
+
+def scale_to_hz(z: np.ndarray | float, scale: BandScale | str) -> np.ndarray:
+    z = np.asarray(z, dtype=np.float64)
+    scale = BandScale(scale)
+    if scale is BandScale.MEL:
+        return 700.0 * (10.0 ** (z / 2595.0) - 1.0)
+    if scale is BandScale.BARK:
+        return 1960.0 * (z + 0.53) / (26.28 - z)
+    return 10.0 ** z
+
+class BandLayout:
+    """
+    Precomputed rFFT-bin -> band weights for one (n_fft, sample_rate, n_bands, fmin, fmax, scale).
+    Applying it is a single matrix product, for one spectrum or a (frames, bins) batch.
+
+    Rectangular bands average the bins between consecutive edges (a band narrower than a bin
+    takes the bin at its lower edge). Triangular bands overlap like a mel filterbank; every
+    row is normalised to sum to 1, so 0..1 magnitudes stay 0..1.
+
+    Get instances through `band_layout()`, which caches them.
+    """
+    def __init__(self, n_fft: int, sample_rate: int, n_bands: int, fmin: float, fmax: float,
+                 scale: BandScale = BandScale.LOG, triangular: bool = False):
+        self.n_fft = int(n_fft)
+        self.sample_rate = int(sample_rate)
+        self.n_bands = int(n_bands)
+        self.fmin = float(fmin)
+        self.fmax = float(fmax)
+        self.scale = BandScale(scale)
+        self.triangular = bool(triangular)
+
+        self.n_bins = self.n_fft // 2 + 1
+        self.freqs = rfftfreq(self.n_fft, 1.0 / self.sample_rate)
+
+        if self.triangular:
+            self.weights = self._triangular_weights()
+        else:
+            self.weights = self._rect_weights()
+        self.weights.setflags(write=False)
+        # Transposed copy so batched (frames, bins) @ (bins, bands) is contiguous too
+        self._weights_t = np.ascontiguousarray(self.weights.T)
+
+    def _points_hz(self, count: int) -> np.ndarray:
+        if self.scale is BandScale.LOG:
+            return np.logspace(np.log10(self.fmin), np.log10(self.fmax), count)
+        lo, hi = hz_to_scale([self.fmin, self.fmax], self.scale)
+        return scale_to_hz(np.linspace(lo, hi, count), self.scale)
+
+    def _rect_weights(self) -> np.ndarray:
+        self.edges_hz = self._points_hz(self.n_bands + 1)
+        idx = np.searchsorted(self.freqs, self.edges_hz, side='left')
+        idx = np.clip(idx, 0, self.n_bins - 1)
+
+        w = np.zeros((self.n_bands, self.n_bins), dtype=np.float32)
+        for i in range(self.n_bands):
+            a, b = int(idx[i]), int(idx[i + 1])
+            if b > a:
+                w[i, a:b] = 1.0 / (b - a)
+            else:
+                w[i, a] = 1.0
+        return w
+
+    def _triangular_weights(self) -> np.ndarray:
+        pts = self._points_hz(self.n_bands + 2)
+        self.edges_hz = pts[1:-1]
+        f = self.freqs
+
+        w = np.zeros((self.n_bands, self.n_bins), dtype=np.float32)
+        for i in range(self.n_bands):
+            lo, mid, hi = pts[i], pts[i + 1], pts[i + 2]
+            up = (f - lo) / max(mid - lo, 1e-9)
+            down = (hi - f) / max(hi - mid, 1e-9)
+            row = np.maximum(0.0, np.minimum(up, down))
+            total = row.sum()
+            if total > 0:
+                w[i] = row / total
+            else:
+                # Narrower than one bin: take the nearest bin to the centre
+                w[i, int(np.argmin(np.abs(f - mid)))] = 1.0
+        return w
+
+    def apply(self, mag: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Band values for `mag` (n_bins,) or (frames, n_bins). Pass a float32 `out` of shape
+        (n_bands,) / (frames, n_bands) to make steady-state calls allocation-free.
+        """
+        if mag.shape[-1] != self.n_bins:
+            raise ValueError(f"expected {self.n_bins} bins, got {mag.shape[-1]}")
+        if mag.dtype != np.float32:
+            mag = mag.astype(np.float32)
+        if mag.ndim == 1:
+            return np.dot(self.weights, mag, out=out)
+        return np.matmul(mag, self._weights_t, out=out)
+
+@lru_cache(maxsize=32)
+def band_layout(n_fft: int, sample_rate: int, n_bands: int, fmin: float = 20.0,
+                fmax: float | None = None, scale: BandScale | str = BandScale.LOG,
+                triangular: bool = False) -> BandLayout:
+    """ Shared, cached BandLayout (built once per distinct key). """
+    fmax = float(fmax) if fmax else sample_rate / 2.0
+    return BandLayout(n_fft, sample_rate, n_bands, float(fmin), fmax, BandScale(scale), triangular)
+
+def noise_gate(bands: np.ndarray, noise_floor_db: float, mask: np.ndarray | None = None) -> np.ndarray:
+    """ Zero bands under the noise floor in place (0..1 maps to -80..0 dB). """
+    thr = (noise_floor_db + 80.0) / 80.0
+    mask = np.less(bands, thr, out=mask)
+    np.copyto(bands, 0.0, where=mask)
+    return bands
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import threading, time
+from collections import deque
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Callable
+
+import numpy as np
+
+from .pool import BlockPool
+
+class BackpressurePolicy(StrEnum):
+    """ What a subscriber queue does with a new block when it is full. """
+    DROP_OLDEST = "drop_oldest"  # evict the oldest queued block, keep the new one
+    DROP_NEWEST = "drop_newest"  # discard the new block
+    LATEST = "latest"  # coalesce: only ever keep the newest block
+    BLOCK = "block"  # wait up to `timeout` for room, then discard the new block
+
+@dataclass(frozen=True)
+class SubscriberStats:
+    name: str
+    policy: BackpressurePolicy
+    delivered: int
+    dropped: int
+    lag: int  # blocks currently queued
+    max_lag: int
+    errors: int
+    cb_time_total_s: float
+    cb_time_max_s: float
+
+    @property
+    def cb_time_mean_s(self) -> float:
+        return self.cb_time_total_s / self.delivered if self.delivered else 0.0
+
+class Subscription:
+    """
+    One subscriber's bounded queue of pool slots plus the worker thread that drains it.
+    Every queued slot holds one pool reference, released after the callback (or on drop).
+    """
+    def __init__(self, cb: Callable[[np.ndarray], None], pool: BlockPool,
+                 policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST,
+                 maxsize: int = 8, timeout: float = 0.05, name: str | None = None):
+        self.cb = cb
+        self.name = name or getattr(cb, "__qualname__", repr(cb))
+        self.policy = BackpressurePolicy(policy)
+        self.maxsize = 1 if self.policy is BackpressurePolicy.LATEST else max(1, int(maxsize))
+        self.timeout = float(timeout)
+
+        self._pool = pool
+        self._q: deque[tuple[int, int]] = deque()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+        self.delivered = 0
+        self.dropped = 0
+        self.max_lag = 0
+        self.errors = 0
+        self.cb_time_total_s = 0.0
+        self.cb_time_max_s = 0.0
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        with self._cond:
+            self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=f"fanout:{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        with self._cond:
+            while self._q:
+                self._pool.release(self._q.popleft()[0])
+
+    def offer(self, slot: int, frames: int) -> bool:
+        """
+        Queue a slot this subscription already holds a reference to, applying the policy.
+        Returns False if the new block was discarded (its reference is released here).
+        A stopped subscription takes nothing: stop() has already drained its queue, so a slot
+        queued now (e.g. by a publish() that raced unsubscribe()) would never be released.
+        """
+        pool = self._pool
+        with self._cond:
+            if self._stopping:
+                pool.release(slot)
+                return False
+            q = self._q
+            if len(q) >= self.maxsize:
+                policy = self.policy
+                if policy is BackpressurePolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    pool.release(slot)
+                    return False
+                if policy is BackpressurePolicy.BLOCK:
+                    deadline = time.monotonic() + self.timeout
+                    while len(q) >= self.maxsize and not self._stopping:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not self._cond.wait(remaining):
+                            break
+                    if self._stopping:
+                        pool.release(slot)
+                        return False
+                    if len(q) >= self.maxsize:
+                        self.dropped += 1
+                        pool.release(slot)
+                        return False
+                else:
+                    # DROP_OLDEST and LATEST both make room by evicting from the front
+                    while len(q) >= self.maxsize:
+                        self.dropped += 1
+                        pool.release(q.popleft()[0])
+
+            q.append((slot, frames))
+            if len(q) > self.max_lag:
+                self.max_lag = len(q)
+            self._cond.notify_all()
+        return True
+
+    def stats(self) -> SubscriberStats:
+        return SubscriberStats(
+            name=self.name,
+            policy=self.policy,
+            delivered=self.delivered,
+            dropped=self.dropped,
+            lag=len(self._q),
+            max_lag=self.max_lag,
+            errors=self.errors,
+            cb_time_total_s=self.cb_time_total_s,
+            cb_time_max_s=self.cb_time_max_s,
+        )
+
+    def _run(self) -> None:
+        pool = self._pool
+        while True:
+            with self._cond:
+                while not self._q and not self._stopping:
+                    self._cond.wait(0.1)
+                if self._stopping:
+                    return
+                slot, frames = self._q.popleft()
+                # Wake a dispatcher waiting under the BLOCK policy
+                self._cond.notify_all()
+
+            t0 = time.perf_counter()
+            try:
+                self.cb(pool.view(slot, frames))
+            except Exception:
+                # Ignore so we don't crash...
+                self.errors += 1
+            finally:
+                pool.release(slot)
+            dt = time.perf_counter() - t0
+            self.delivered += 1
+            self.cb_time_total_s += dt
+            if dt > self.cb_time_max_s:
+                self.cb_time_max_s = dt
+
+class FrameFanout:
+    """
+    Distributes pooled audio blocks to subscribers, each with its own queue and worker,
+    so a slow consumer only ever falls behind itself.
+
+    `publish()` runs on the capture's dispatcher thread (never the realtime callback), so the
+    BLOCK policy can wait there without stalling PortAudio. Note that a BLOCK subscriber does
+    hold up delivery to subscribers after it in the list for up to its timeout.
+    """
+    def __init__(self, pool: BlockPool):
+        self._pool = pool
+        self._subs: list[Subscription] = []
+        self._lock = threading.Lock()
+        self._running = False
+
+    def subscribe(self, cb: Callable[[np.ndarray], None],
+                  policy: BackpressurePolicy | str = BackpressurePolicy.DROP_OLDEST,
+                  maxsize: int = 8, timeout: float = 0.05, name: str | None = None) -> Subscription:
+        sub = Subscription(cb, self._pool, BackpressurePolicy(policy), maxsize, timeout, name)
+        with self._lock:
+            self._subs = [*self._subs, sub]
+            if self._running:
+                sub.start()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subs = [s for s in self._subs if s is not sub]
+        sub.stop()
+
+    def start(self) -> None:
+        with self._lock:
+            self._running = True
+            for sub in self._subs:
+                sub.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._running = False
+            subs = self._subs
+        for sub in subs:
+            sub.stop()
+
+    def publish(self, slot: int, frames: int) -> None:
+        """ Offer a slot to every subscriber. The caller keeps (and must release) its own reference. """
+        subs = self._subs  # copy-on-write list, safe to iterate without the lock
+        if not subs:
+            return
+        self._pool.retain(slot, len(subs))
+        for sub in subs:
+            sub.offer(slot, frames)
+
+    def stats(self) -> list[SubscriberStats]:
+        return [sub.stats() for sub in self._subs]
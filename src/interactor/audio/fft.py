@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import os, threading, time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+try:
+    import scipy.fft as _scipy_fft
+except ImportError:
+    _scipy_fft = None
+
+try:
+    import pyfftw as _pyfftw
+except ImportError:
+    _pyfftw = None
+
+class FFTPlan(ABC):
+    """
+    A planned real FFT over a fixed (frames, n_fft) float32 input. Fill `input` in place,
+    call `execute()`, read the (frames, n_fft//2+1) complex64 result it returns. Both arrays
+    are owned by the plan and reused on every call.
+    """
+    input: np.ndarray
+    output: np.ndarray
+
+    def __init__(self, n_fft: int, frames: int):
+        self.n_fft = int(n_fft)
+        self.frames = int(frames)
+        self.n_bins = self.n_fft // 2 + 1
+
+    @abstractmethod
+    def execute(self) -> np.ndarray: ...
+
+class FFTBackend(ABC):
+    """
+    Creates and caches FFTPlans per (n_fft, frames), keeping the `max_plans` most recently
+    used. Plans own their buffers, so an instance belongs to one consumer thread; get one per
+    consumer from `create_backend()`.
+    """
+    name = "base"
+    max_plans = 16  # a power-of-two ladder up to 2**14 frames fits
+
+    def __init__(self):
+        self._plans: dict[tuple[int, int], FFTPlan] = {}
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def plan(self, n_fft: int, frames: int = 1) -> FFTPlan:
+        key = (int(n_fft), int(frames))
+        plan = self._plans.pop(key, None)
+        if plan is None:
+            plan = self._make_plan(*key)
+            while len(self._plans) >= self.max_plans:
+                del self._plans[next(iter(self._plans))]  # least recently used
+        self._plans[key] = plan
+        return plan
+
+    @abstractmethod
+    def _make_plan(self, n_fft: int, frames: int) -> FFTPlan: ...
+
+    def rfft(self, x: np.ndarray) -> np.ndarray:
+        """ Convenience one-shot rfft of a 1-D or (frames, n_fft) array; returns the plan's output. """
+        x2 = x.reshape(1, -1) if x.ndim == 1 else x
+        plan = self.plan(x2.shape[1], x2.shape[0])
+        np.copyto(plan.input, x2, casting='same_kind')
+        out = plan.execute()
+        return out[0] if x.ndim == 1 else out
+
+class _NumpyPlan(FFTPlan):
+    def __init__(self, n_fft: int, frames: int):
+        super().__init__(n_fft, frames)
+        self.input = np.zeros((frames, n_fft), dtype=np.float32)
+        self.output = np.zeros((frames, self.n_bins), dtype=np.complex64)
+
+    def execute(self) -> np.ndarray:
+        # NumPy >= 2 computes float32 natively and writes straight into `out`
+        return np.fft.rfft(self.input, axis=1, out=self.output)
+
+class NumpyFFT(FFTBackend):
+    name = "numpy"
+
+    def _make_plan(self, n_fft: int, frames: int) -> FFTPlan:
+        return _NumpyPlan(n_fft, frames)
+
+class _ScipyPlan(FFTPlan):
+    def __init__(self, n_fft: int, frames: int, workers: int):
+        super().__init__(n_fft, frames)
+        self.workers = workers
+        self.input = np.zeros((frames, n_fft), dtype=np.float32)
+        self.output = np.zeros((frames, self.n_bins), dtype=np.complex64)
+
+    def execute(self) -> np.ndarray:
+        res = _scipy_fft.rfft(self.input, axis=1, workers=self.workers, overwrite_x=True)
+        np.copyto(self.output, res)
+        return self.output
+
+class ScipyFFT(FFTBackend):
+    name = "scipy"
+
+    def __init__(self, workers: int | None = None):
+        super().__init__()
+        self.workers = workers or max(1, min(4, os.cpu_count() or 1))
+
+    @classmethod
+    def available(cls) -> bool:
+        return _scipy_fft is not None
+
+    def _make_plan(self, n_fft: int, frames: int) -> FFTPlan:
+        # One worker per frame at most, small single frames don't benefit from threads
+        return _ScipyPlan(n_fft, frames, min(self.workers, frames))
+
+class _FFTWPlan(FFTPlan):
+    def __init__(self, n_fft: int, frames: int, threads: int):
+        super().__init__(n_fft, frames)
+        self.input = _pyfftw.empty_aligned((frames, n_fft), dtype='float32')
+        self.output = _pyfftw.empty_aligned((frames, self.n_bins), dtype='complex64')
+        # FFTW_MEASURE scribbles over the input while planning, that's fine before first use
+        self._fftw = _pyfftw.FFTW(self.input, self.output, axes=(1,), direction='FFTW_FORWARD',
+                                  flags=('FFTW_MEASURE',), threads=threads)
+        self.input[:] = 0.0
+
+    def execute(self) -> np.ndarray:
+        self._fftw.execute()
+        return self.output
+
+class FFTWBackend(FFTBackend):
+    name = "pyfftw"
+
+    def __init__(self, threads: int | None = None):
+        super().__init__()
+        self.threads = threads or 1
+
+    @classmethod
+    def available(cls) -> bool:
+        return _pyfftw is not None
+
+    def _make_plan(self, n_fft: int, frames: int) -> FFTPlan:
+        return _FFTWPlan(n_fft, frames, self.threads)
+
+BACKENDS: dict[str, type[FFTBackend]] = {
+    NumpyFFT.name: NumpyFFT,
+    ScipyFFT.name: ScipyFFT,
+    FFTWBackend.name: FFTWBackend,
+}
+
+def available_backends() -> list[str]:
+    return [name for name, cls in BACKENDS.items() if cls.available()]
+
+def benchmark(n_fft: int = 1024, frames: int = 4, repeats: int = 200) -> dict[str, float]:
+    """ Best-of seconds per execute() for every installed backend on this host. """
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((frames, n_fft)).astype(np.float32)
+    results: dict[str, float] = {}
+    for name in available_backends():
+        try:
+            plan = BACKENDS[name]().plan(n_fft, frames)
+        except Exception:
+            continue
+        best = float("inf")
+        for _ in range(3):
+            t0 = time.perf_counter()
+            for _ in range(repeats):
+                np.copyto(plan.input, data)
+                plan.execute()
+            best = min(best, (time.perf_counter() - t0) / repeats)
+        results[name] = best
+    return results
+
+_selected: type[FFTBackend] | None = None
+_selected_lock = threading.Lock()
+last_benchmark: dict[str, float] = {}
+
+def select_backend(name: str = "auto") -> type[FFTBackend]:
+    """
+    Backend class to use on this host. "auto" runs `benchmark()` once, on first use, and keeps
+    the fastest; an explicit name (numpy / scipy / pyfftw) falls back to auto if not installed.
+    Either way the choice is recorded, so backend_report() and later "auto" calls see it.
+    """
+    global _selected, last_benchmark
+    if name != "auto" and name in BACKENDS and BACKENDS[name].available():
+        with _selected_lock:
+            _selected = BACKENDS[name]
+        return _selected
+
+    if _selected is None:
+        with _selected_lock:
+            if _selected is None:
+                last_benchmark = benchmark()
+                fastest = min(last_benchmark, key=last_benchmark.get, default=NumpyFFT.name)
+                _selected = BACKENDS[fastest]
+    return _selected
+
+def create_backend(name: str = "auto") -> FFTBackend:
+    """ A fresh backend instance (own plan cache) of the selected type. """
+    return select_backend(name)()
+
+def backend_report() -> str:
+    """ One-line summary of the selected backend and the startup benchmark timings (if one ran). """
+    chosen = _selected.name if _selected else "not selected yet"
+    if not last_benchmark:
+        return f"FFT backend: {chosen}"
+    timings = ", ".join(f"{k}={v * 1e6:.1f}us" for k, v in sorted(last_benchmark.items(), key=lambda kv: kv[1]))
+    return f"FFT backend: {chosen} ({timings})"
@@ -1,36 +1,66 @@
-import threading, queue
+import threading
 
 import numpy as np
 import sounddevice as sd
 
 from ..core.config import Settings
+from .fanout import BackpressurePolicy, FrameFanout, SubscriberStats, Subscription
+from .pool import BlockPool
+from .ringbuffer import SpscRingBuffer, SpscSlotRing, TornReadError
 
 class RealTimeAudioCapture:
-    def __init__(self, config: Settings, max_record_seconds: float = 0.0):
+    """
+    Captures mono float32 audio into a lock-free ring and fans blocks out to subscribers.
+
+    Blocks handed to `subscribe_frames` callbacks live in a recycled pool slab: they are only
+    valid for the duration of the callback, so copy anything you need to keep.
+    """
+    def __init__(self, config: Settings, max_record_seconds: float = 0.0, pool_blocks: int = 32):
         self.config = config
         self._sr = int(config.sample_rate)
         self.samples_captured = 0
 
-        # Preallocate a NumPy circular buffer of samples
+        # Preallocate a lock-free circular buffer of samples (callback writes, readers never block it)
         cap_samples = (int(self._sr * max_record_seconds)
                        if max_record_seconds > 0 else config.buffer_size * 8)
-        self._buf = np.zeros(cap_samples, dtype=np.float32)
-        self._write = 0
-        self._lock = threading.Lock()
-
-        self._subs = []
-        self._q = queue.Queue(maxsize=8)
+        self._ring = SpscRingBuffer(cap_samples)
+
+        # Recycled block slabs for the callback -> subscriber handoff, plus a callback-owned
+        # scratch slab for when the pool runs dry (the ring still gets the samples)
+        self._pool = BlockPool(config.blocksize, pool_blocks)
+        self._scratch = np.zeros(config.blocksize, dtype=np.float32)
+
+        self._fanout = FrameFanout(self._pool)
+        # Callback -> dispatcher handoff of slot indices: no lock, nothing allocated per block.
+        # The callback sets `_ready` after each push so the dispatcher sleeps until there's work.
+        self._handoff = SpscSlotRing(8)
+        self._ready = threading.Event()
         self._fanout_thread = None
         self._stop_evt = threading.Event()
 
         self.stream = None
         self.xruns = 0
+        self.dropped_blocks = 0
+        self.torn_reads = 0
+
+    def subscribe_frames(self, cb, policy: BackpressurePolicy | str = BackpressurePolicy.DROP_OLDEST,
+                         maxsize: int = 8, timeout: float = 0.05, name: str | None = None) -> Subscription:
+        """
+        Register a per-block callback. Each subscriber gets its own bounded queue and worker
+        thread; `policy` decides what happens when it falls `maxsize` blocks behind.
+        """
+        return self._fanout.subscribe(cb, policy=policy, maxsize=maxsize, timeout=timeout, name=name)
+
+    def unsubscribe_frames(self, sub: Subscription) -> None:
+        self._fanout.unsubscribe(sub)
 
-    def subscribe_frames(self, cb):
-        self._subs.append(cb)
+    def subscriber_stats(self) -> list[SubscriberStats]:
+        """ Per-subscriber lag / drop / callback-time counters. """
+        return self._fanout.stats()
 
     def start(self):
         self._stop_evt.clear()
+        self._ready.clear()
         self._start_fanout()
         try:
             ch = 1
@@ -60,76 +90,109 @@ class RealTimeAudioCapture:
 
     def stop(self):
         self._stop_evt.set()
+        self._ready.set()
         if self.stream:
             self.stream.stop(); self.stream.close(); self.stream = None
         if self._fanout_thread:
             self._fanout_thread.join(timeout=1.0)
-        with self._lock:
-            self._write = 0
-            self._buf[:] = 0
+        self._fanout.stop()
+        # Hand back slabs that never reached the fanout thread
+        while (entry := self._handoff.pop()) is not None:
+            self._pool.release(entry[0])
+        self._ring.reset()
 
     def __enter__(self): return self.start()
     def __exit__(self, *exc): self.stop()
 
-    def get_audio_data(self) -> np.ndarray:
-        """Return the latest buffer_size samples (no allocation if contiguous)."""
+    def get_audio_data(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Return the latest buffer_size samples (oldest first, zero-padded until the ring fills).
+        Pass `out` to copy into a caller-owned array instead of allocating.
+        """
         n = self.config.buffer_size
-        with self._lock:
-            w = self._write
-            if n <= w:
-                # contiguous slice
-                return self._buf[w - n:w].copy()
-            # wrap-around: stitch tail+head
-            tail = self._buf[max(0, w - n):w]
-            head = self._buf[:max(0, n - len(tail))]
-            return np.concatenate((tail, head)) if head.size else tail.copy()
+        try:
+            return self._ring.read_latest(n, out=out)
+        except TornReadError:
+            # Reader kept getting lapped by the callback; report silence rather than garbage
+            self.torn_reads += 1
+            if out is None:
+                return np.zeros(n, dtype=np.float32)
+            out[:] = 0
+            return out
+
+    def latest_views(self, n: int) -> tuple[int, tuple[np.ndarray, ...]]:
+        """
+        Zero-copy views of the most recent n samples (see SpscRingBuffer.latest_views).
+        Validate with `is_torn(seq, n)` once done with the views.
+        """
+        return self._ring.latest_views(n)
+
+    def is_torn(self, seq: int, n: int) -> bool:
+        return self._ring.is_torn(seq, n)
 
     @property
     def sample_rate(self) -> int:
         return self._sr
 
+    @property
+    def pool_exhausted(self) -> int:
+        """ Callbacks that found no free slab (block reached the ring but not subscribers). """
+        return self._pool.exhausted
+
+    @property
+    def pool_reused(self) -> int:
+        """ Callbacks served by a recycled slab. """
+        return self._pool.reused
+
     def _callback(self, indata, frames, time_info, status):
         if status and status.input_overflow:
             self.xruns += 1
 
+        pool = self._pool
+        slot = pool.acquire() if frames <= pool.block_size else -1
+        if slot >= 0:
+            mono = pool.view(slot, frames)
+        elif frames <= self._scratch.shape[0]:
+            mono = self._scratch[:frames]
+        else:
+            # Host ignored our blocksize, nothing preallocated fits
+            mono = np.empty(frames, dtype=np.float32)
+
+        # Downmix / copy straight into the slab (never share PortAudio memory)
         if indata.shape[1] == 2:
-            mono = indata.mean(axis=1, dtype=np.float32)
+            np.mean(indata, axis=1, out=mono)
         else:
-            mono = indata[:, 0].astype(np.float32, copy=False)
-
-        # Write into ring buffer
-        with self._lock:
-            w = self._write
-            N = mono.shape[0]
-            buf = self._buf
-            end = w + N
-            if end <= buf.size:
-                buf[w: end] = mono
-            else:
-                k = buf.size - w
-                buf[w:] = mono[:k]
-                buf[: N - k] = mono[k:]
-            self._write = (w + N) % buf.size
-            self.samples_captured += frames
-
-        # Non-blocking handoff to fanout thread
-        try:
-            self._q.put_nowait(mono.copy()) # Copy as so we don't share PortAudio memory
-        except queue.Full:
-            pass # Skip for now
+            mono[:] = indata[:, 0]
+
+        # Write into ring buffer (no lock, readers detect overruns themselves)
+        self._ring.write(mono)
+        self.samples_captured += frames
+
+        if slot < 0:
+            return
+
+        # Lock-free handoff to the dispatcher thread, which owns the slot from here
+        if not self._handoff.push(slot, frames):
+            self.dropped_blocks += 1
+            pool.release(slot)
+            return
+        self._ready.set()
 
     def _start_fanout(self):
+        self._fanout.start()
+
         def run():
+            pool, handoff, ready = self._pool, self._handoff, self._ready
             while not self._stop_evt.is_set():
-                try:
-                    block = self._q.get(timeout=0.1)
-                except queue.Empty:
+                # Timeout only so a stop is noticed even if the stream never delivers
+                if not ready.wait(0.1):
                     continue
-                for cb in list(self._subs):
-                    try:
-                        cb(block)
-                    except Exception:
-                        # Ignore so we don't crash...
-                        continue
+                # Clear before draining: a push that lands after the last pop sets it again
+                ready.clear()
+                while (entry := handoff.pop()) is not None:
+                    slot, frames = entry
+                    # Subscriber queues take their own references, drop ours
+                    self._fanout.publish(slot, frames)
+                    pool.release(slot)
         self._fanout_thread = threading.Thread(target=run, daemon=True)
         self._fanout_thread.start()
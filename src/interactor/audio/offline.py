@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from ..core.config import Settings
+from .banding import BandScale, band_layout, noise_gate
+from .fft import create_backend
+from .stft import BatchSpectrum, frame_signal
+
+try:
+    import soundfile as sf
+except (ImportError, OSError):  # missing package or missing libsndfile
+    sf = None
+
+def frame_count(n_samples: int, n_fft: int, hop: int) -> int:
+    """ Frames for a signal, frame i covering samples [i*hop, i*hop + n_fft) (short input pads to 1). """
+    if n_samples <= 0:
+        return 0
+    if n_samples < n_fft:
+        return 1
+    return 1 + (n_samples - n_fft) // hop
+
+class OfflineAnalyzer:
+    """
+    Framed, windowed, hop-based spectra and band matrices over whole buffers or files,
+    processed `chunk_frames` frames at a time in one batched rfft per chunk. Working memory
+    is bounded by the chunk (plus the band matrix itself), whatever the track length.
+    Output matches SpectrumWorker: dB-normalised 0..1 bands with the noise floor gate applied.
+
+    Usage:
+        an = OfflineAnalyzer(settings, n_fft=1024, hop=512, n_bands=48)
+        bands = an.band_matrix(samples)          # (n_frames, 48)
+        bands, sr = an.analyze_file(flac_path)
+    """
+    def __init__(self, settings: Settings, n_fft: int = 1024, hop: int = 512, n_bands: int = 48,
+                 fmin_hz: float = 40.0, fmax_hz: float | None = None,
+                 scale: BandScale | str = BandScale.LOG, triangular: bool = False,
+                 chunk_frames: int = 256):
+        if hop <= 0 or hop > n_fft:
+            raise ValueError("hop must be in 1..n_fft")
+        self.s = settings
+        self.n_fft = int(n_fft)
+        self.hop = int(hop)
+        self.n_bands = int(n_bands)
+        self.fmin = float(fmin_hz)
+        self.fmax = fmax_hz
+        self.scale = BandScale(scale)
+        self.triangular = bool(triangular)
+        self.chunk_frames = max(1, int(chunk_frames))
+
+        # Per-chunk work buffers, reused across chunks and calls
+        self._spectrum = BatchSpectrum(self.n_fft, self.chunk_frames, create_backend(settings.fft_backend))
+        self._mask = np.empty((self.chunk_frames, self.n_bands), dtype=bool)
+
+    def _layout(self, sample_rate: int):
+        fmax = self.fmax or sample_rate / 2.0
+        return band_layout(self.n_fft, sample_rate, self.n_bands, self.fmin, fmax,
+                           self.scale, self.triangular)
+
+    def iter_spectra(self, frames: np.ndarray) -> Iterator[np.ndarray]:
+        """
+        Yield 0..1 magnitude chunks (k, n_bins) for a framed signal. Each chunk is a reused
+        buffer, valid until the next one is produced.
+        """
+        for i in range(0, frames.shape[0], self.chunk_frames):
+            yield self._spectrum.magnitudes(frames[i:i + self.chunk_frames])
+
+    def _bands_into(self, frames: np.ndarray, out: np.ndarray, sample_rate: int) -> None:
+        layout = self._layout(sample_rate)
+        pos = 0
+        for mag in self.iter_spectra(frames):
+            k = mag.shape[0]
+            layout.apply(mag, out=out[pos:pos + k])
+            noise_gate(out[pos:pos + k], self.s.noise_floor_db, self._mask[:k])
+            pos += k
+
+    def band_matrix(self, samples: np.ndarray, sample_rate: int | None = None) -> np.ndarray:
+        """ (n_frames, n_bands) float32 band matrix for a long mono buffer. """
+        sr = int(sample_rate or self.s.sample_rate)
+        x = np.asarray(samples, dtype=np.float32)
+        if 0 < x.shape[0] < self.n_fft:
+            x = np.pad(x, (0, self.n_fft - x.shape[0]))
+        frames = frame_signal(x, self.n_fft, self.hop)
+        out = np.empty((frames.shape[0], self.n_bands), dtype=np.float32)
+        self._bands_into(frames, out, sr)
+        return out
+
+    def band_matrix_blocks(self, blocks: Iterable[np.ndarray], n_samples: int,
+                           sample_rate: int) -> np.ndarray:
+        """
+        Band matrix for a signal delivered as consecutive mono blocks (e.g. a streaming decode)
+        of known total length. Only the current block plus an n_fft - hop carry is held.
+        """
+        total = frame_count(n_samples, self.n_fft, self.hop)
+        out = np.empty((total, self.n_bands), dtype=np.float32)
+        carry = np.empty(0, dtype=np.float32)
+        pos = 0
+        for block in blocks:
+            buf = np.concatenate((carry, np.asarray(block, dtype=np.float32)))
+            frames = frame_signal(buf, self.n_fft, self.hop)[:total - pos]
+            k = frames.shape[0]
+            if k:
+                self._bands_into(frames, out[pos:pos + k], sample_rate)
+                pos += k
+            # Keep everything from the first frame start we haven't consumed yet
+            carry = buf[k * self.hop:].copy()
+
+        if pos < total:
+            # Tail shorter than a frame (or a signal shorter than n_fft): zero pad it
+            tail = np.zeros(self.n_fft, dtype=np.float32)
+            tail[:min(carry.shape[0], self.n_fft)] = carry[:self.n_fft]
+            self._bands_into(tail[None, :], out[pos:pos + 1], sample_rate)
+            pos += 1
+        return out[:pos]
+
+    def analyze_file(self, path: str | Path) -> tuple[np.ndarray, int]:
+        """
+        Decode a FLAC from the library block by block and return (band matrix, sample_rate).
+        The length comes from the FLAC header (mutagen as a fallback); decoding needs soundfile.
+        """
+        from ..media.flac_header import open_flac
+
+        path = Path(path)
+        info = open_flac(path).info
+        sr = int(info.sample_rate)
+        n_samples = int(info.total_samples)
+
+        if sf is None:
+            raise RuntimeError("soundfile is required to decode audio files (pip install soundfile)")
+
+        block = self.chunk_frames * self.hop
+
+        def mono_blocks():
+            with sf.SoundFile(str(path)) as f:
+                for data in f.blocks(blocksize=block, dtype='float32', always_2d=True):
+                    yield data.mean(axis=1, dtype=np.float32) if data.shape[1] > 1 else data[:, 0]
+
+        return self.band_matrix_blocks(mono_blocks(), n_samples, sr), sr
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+import numpy as np
+
+class BlockPool:
+    """
+    Fixed set of preallocated float32 block slabs that get recycled between the audio
+    callback and frame subscribers, so the realtime path never allocates sample memory.
+
+    Slabs are addressed by slot index. The callback `acquire()`s a free slot (a deque pop,
+    atomic under the GIL, so no lock on the realtime thread), fills `slab(slot)` in place and
+    hands the slot on. Each holder calls `release(slot)` when done; `retain(slot, n)` adds
+    holders before fanning a slot out. A slot goes back on the free list when its count hits 0.
+    """
+    def __init__(self, block_size: int, count: int = 32):
+        if block_size <= 0 or count <= 0:
+            raise ValueError("block_size and count must be positive")
+        self.block_size = int(block_size)
+        self.count = int(count)
+        self._slabs = np.zeros((self.count, self.block_size), dtype=np.float32)
+        self._rows = list(self._slabs)  # row views made once, not per callback
+        self._refs = [0] * self.count
+        self._free: deque[int] = deque(range(self.count))
+        self._used = [False] * self.count
+        self._lock = threading.Lock()  # only taken by consumers in retain/release
+
+        self.exhausted = 0  # acquire() found no free slab
+        self.reused = 0  # acquire() handed out a slab that had been used before
+
+    def acquire(self) -> int:
+        """ Take a free slot with one holder, or -1 if the pool is exhausted. """
+        try:
+            slot = self._free.popleft()
+        except IndexError:
+            self.exhausted += 1
+            return -1
+        if self._used[slot]:
+            self.reused += 1
+        else:
+            self._used[slot] = True
+        self._refs[slot] = 1
+        return slot
+
+    def slab(self, slot: int) -> np.ndarray:
+        """ Full-size writable slab for a slot. """
+        return self._rows[slot]
+
+    def view(self, slot: int, frames: int) -> np.ndarray:
+        """ The first `frames` samples of a slot's slab. """
+        row = self._rows[slot]
+        return row if frames == self.block_size else row[:frames]
+
+    def retain(self, slot: int, n: int = 1) -> None:
+        with self._lock:
+            self._refs[slot] += n
+
+    def release(self, slot: int) -> None:
+        with self._lock:
+            refs = self._refs[slot] - 1
+            if refs < 0:
+                raise ValueError(f"slot {slot} released more times than acquired")
+            self._refs[slot] = refs
+            if refs == 0:
+                self._free.append(slot)
+
+    @property
+    def available(self) -> int:
+        return len(self._free)
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import time
+import warnings
+
 import numpy as np
-from numpy.fft import rfft, rfftfreq
 
-from ..core.config import Settings
+from ..core.config import SPECTRUM_N_FFT, Settings
+from .banding import BandScale, band_layout, noise_gate
+from .fft import create_backend
+from .smoothing import BandSmoother
+from .snapshot import SnapshotBuffer
+from .stft import BatchSpectrum, frame_signal, normalize_db
+from .vizcache import CachedSpectrumSource, VizCache
 
 class AudioProcessor:
     """
@@ -11,6 +19,7 @@ class AudioProcessor:
     """
     def __init__(self, settings: Settings):
         self.s = settings
+        self._fft = create_backend(settings.fft_backend)
         self._win_cache: dict[int, np.ndarray] = {self.s.buffer_size: np.hanning(self.s.buffer_size).astype(np.float32)}
 
     def _hann(self, size: int) -> np.ndarray:
@@ -41,112 +50,211 @@ class AudioProcessor:
         if n == 0 or float(np.max(np.abs(audio_data))) < self.s.silence_threshold:
             return np.zeros(n // 2 + 1, dtype=np.float32)
 
-        window = self._hann(n)
-        X = rfft(window * audio_data)
-        mag = np.abs(X).astype(np.float32)
-
-        mag_db = 20.0 * np.log10(mag + 1e-10)
-        mag_db = np.clip(mag_db, -80, 0.0)
-        mag_norm = (mag_db + 80.0) / 80.0
-        return mag_norm.astype(np.float32)
+        # Window straight into the planned FFT input for this size
+        plan = self._fft.plan(n, 1)
+        np.multiply(audio_data, self._hann(n), out=plan.input[0])
+        return normalize_db(np.abs(plan.execute()[0]))
 
-    def group_frequencies(self, fft_magnitudes: np.ndarray, num_bands: int = 32) -> np.ndarray:
+    def group_frequencies(self, fft_magnitudes: np.ndarray, num_bands: int = 32,
+                          scale: BandScale | str = BandScale.LOG, triangular: bool = False,
+                          out: np.ndarray | None = None) -> np.ndarray:
         """
-        Group FFT bins into log-spaced bands for visualization (returns 0..1).
-        Applies a noise-floor gate in dB before returning.
+        Group FFT bins into log-spaced (or mel / bark) bands for visualization (returns 0..1).
+        Applies a noise-floor gate in dB before returning. Pass a float32 `out` of length
+        num_bands to avoid allocating.
         """
         if fft_magnitudes.size == 0:
             return np.zeros(num_bands, dtype=np.float32)
 
-        num_bins = fft_magnitudes.size
-        min_freq = 20.0
-        max_freq = self.s.sample_rate / 2.0
-
-        # Frequency vector for this FFT (infer N from rfft length)
-        # rfftfreq expects the full N (where len(rfft) = N//2 + 1) -> N = (num_bins-1)*2
-        full_n = (num_bins - 1) * 2
-        freqs = rfftfreq(full_n, 1.0 / self.s.sample_rate)
-
-        # Log-spaced edges in Hz
-        edges_hz = np.logspace(np.log10(min_freq), np.log10(max_freq), num_bands + 1)
-
-        # Convert edges to bin indices via searchsorted
-        idx = np.searchsorted(freqs, edges_hz, side='left')
-        idx = np.clip(idx, 0, num_bins - 1)
-
-        bands = np.zeros(num_bands, dtype=np.float32)
-        for i in range(num_bands):
-            a, b = int(idx[i]), int(idx[i + 1])
-            if b > a:
-                bands[i] = float(fft_magnitudes[a:b].mean())
-            else:
-                bands[i] = float(fft_magnitudes[a])
-
-        # Apply noise floor in dB space
-        bands_db = bands * 80.0 - 80.0
-        bands[bands_db < self.s.noise_floor_db] = 0.0
-        return bands
+        # rfft length is N//2 + 1 -> N = (num_bins-1)*2; the layout for it is built once and cached
+        full_n = (fft_magnitudes.size - 1) * 2
+        layout = band_layout(full_n, self.s.sample_rate, num_bands, 20.0, self.s.sample_rate / 2.0,
+                             scale, triangular)
+        bands = layout.apply(fft_magnitudes, out=out)
+        return noise_gate(bands, self.s.noise_floor_db)
 
 class SpectrumWorker:
     """
     Subscribes to audio frames and keeps a ready-to-render band vector for the visualizer.
+
+    Keeps its own sliding history of n_fft samples and emits a spectrum every `hop` samples
+    (overlapping STFT), independent of the PortAudio block size. All frames completed by a
+    block are windowed and transformed in one batched call, then run through a BandSmoother
+    (attack/release, peak hold, optional AGC; configured in Settings) on this worker thread,
+    so readers only ever copy ready-to-draw values.
+
+    Results are published through a double-buffered SnapshotBuffer (row 0 bands, row 1 peaks):
+    `read_bands_into(out)` copies without allocating and `wait_for_new(seq)` blocks until the
+    next frame instead of polling.
     Usage:
-        worker = SpectrumWorker(audio, settings, n_fft=1024, n_bands=48)
+        worker = SpectrumWorker(audio, settings, n_fft=1024, n_bands=48, hop=256)
         bins = worker.latest_bands()
+        peaks = worker.latest_peaks()
+
+        seq = worker.read_bands_into(out)         # render loop, no allocation
+        seq = worker.wait_for_new(seq, timeout=0.1)
     """
-    def __init__(self, audio, settings: Settings, n_fft: int = 1024, n_bands: int = 48,
-                 fmin_hz: float = 40.0, fmax_hz: float | None = None):
+    def __init__(self, audio, settings: Settings, n_fft: int = SPECTRUM_N_FFT, n_bands: int = 48,
+                 fmin_hz: float = 40.0, fmax_hz: float | None = None,
+                 scale: BandScale | str = BandScale.LOG, triangular: bool = False,
+                 hop: int | None = None, smooth: bool = True):
         self._audio = audio
         self._s = settings
         self._n_fft = int(n_fft)
-        self._proc = AudioProcessor(settings)
         self._n_bands = int(n_bands)
         self._fmin = float(fmin_hz)
         self._fmax = float(fmax_hz or (settings.sample_rate / 2.0))
+        if hop is None and settings.spectrum_hop > self._n_fft:
+            # Settings only know the default FFT size, a smaller one caps the hop rather than failing
+            warnings.warn(f"spectrum_hop {settings.spectrum_hop} is larger than n_fft {self._n_fft}, using {self._n_fft}")
+            hop = self._n_fft
+        self._hop = int(hop or settings.spectrum_hop)
+        if not 0 < self._hop <= self._n_fft:
+            raise ValueError("hop must be in 1..n_fft")
+
+        # History: the unconsumed tail of the signal, starting at the next frame's first sample.
+        # Primed with n_fft - hop zeros so the first spectrum lands after one hop of audio.
+        max_new = max(int(settings.blocksize), self._hop)
+        self._hist = np.zeros(self._n_fft + max_new, dtype=np.float32)
+        self._fill = self._n_fft - self._hop
+        max_frames = 1 + max_new // self._hop
+
+        # Reusable batch FFT buffers and band outputs for this FFT size
+        self._spectrum = BatchSpectrum(self._n_fft, max_frames, create_backend(settings.fft_backend))
 
-        # Reusable window for this FFT size
-        self._win = self._proc._hann(self._n_fft)
+        # Shared band layout for this FFT length (same cache group_frequencies uses)
+        self._layout = band_layout(self._n_fft, self._s.sample_rate, self._n_bands,
+                                   self._fmin, self._fmax, scale, triangular)
+        self._bands = np.zeros((max_frames, self._n_bands), dtype=np.float32)
+        self._gate_mask = np.zeros((max_frames, self._n_bands), dtype=bool)
+        self._snap = SnapshotBuffer((2, self._n_bands))
 
-        # Precompute edges for band grouping once for this FFT length
-        # group_frequencies logic is reused but precomputed arrays are used for speed
-        self._freqs = rfftfreq(self._n_fft, 1.0 / self._s.sample_rate)
-        self._edges = np.logspace(np.log10(self._fmin), np.log10(self._fmax), self._n_bands + 1)
-        self._latest = np.zeros(self._n_bands, dtype=np.float32)
+        # Temporal smoothing / peak hold, stepped once per emitted frame
+        frame_rate = self._s.sample_rate / self._hop
+        self._smoother = BandSmoother.from_settings(settings, self._n_bands, frame_rate) if smooth else None
+
+        # Throughput stats
+        self.frames_emitted = 0
+        self._cost_ema_s = 0.0
+        self._fps = 0.0
+        self._fps_frames = 0
+        self._fps_t0 = time.perf_counter()
 
         # Subscribe to audio frames
         audio.subscribe_frames(self._on_block)
 
+    @property
+    def hop(self) -> int:
+        return self._hop
+
+    @property
+    def fps(self) -> float:
+        """ Spectra emitted per second, measured over roughly the last second. """
+        return self._fps
+
+    @property
+    def frame_cost_ms(self) -> float:
+        """ Smoothed processing time per emitted spectrum. """
+        return self._cost_ema_s * 1000.0
+
     def _on_block(self, mono: np.ndarray) -> None:
-        # Take last n_fft samples (padded with zeros if short)
-        if mono.size < self._n_fft:
-            buf = np.zeros(self._n_fft, dtype=np.float64)
-            buf[-mono.size:] = mono
+        # Feed in pieces no larger than the history headroom (only matters if the host
+        # delivers blocks bigger than the configured blocksize)
+        room = self._hist.shape[0] - self._n_fft
+        for i in range(0, mono.shape[0], room):
+            self._feed(mono[i:i + room])
+
+    def _feed(self, mono: np.ndarray) -> None:
+        hist, fill, n = self._hist, self._fill, mono.shape[0]
+        hist[fill:fill + n] = mono
+        fill += n
+
+        if fill < self._n_fft:
+            self._fill = fill
+            return
+
+        t0 = time.perf_counter()
+        frames = frame_signal(hist[:fill], self._n_fft, self._hop)
+        k = frames.shape[0]
+
+        # FFT -> dB-normalization for every completed frame at once
+        mag_norm = self._spectrum.magnitudes(frames)
+
+        # Group bins into bands with one matrix product, then noise floor gate
+        bands = self._bands[:k]
+        self._layout.apply(mag_norm, out=bands)
+        noise_gate(bands, self._s.noise_floor_db, self._gate_mask[:k])
+
+        # Publish bands + peaks together into the back buffer and flip
+        back = self._snap.begin()
+        if self._smoother is not None:
+            self._smoother.process(bands)
+            back[0] = self._smoother.values
+            back[1] = self._smoother.peaks
         else:
-            buf = mono[-self._n_fft:]
-
-        # FFT -> dB-normalization
-        X = rfft(buf * self._win)
-        mag = np.abs(X, dtype=np.float32)
-        mag_db = 20.0 * np.log10(mag + 1e-10)
-        mag_db = np.clip(mag_db, -80.0, 0.0)
-        mag_norm = (mag_db + 80.0) / 80.0
-
-        # Group bins into log bands using precomputed edges
-        idx = np.searchsorted(self._freqs, self._edges, side='left')
-        idx = np.clip(idx, 0, mag_norm.size - 1)
-        bands = np.empty(self._n_bands, dtype=np.float32)
-        for i in range(self._n_bands):
-            a, b = int(idx[i]), int(idx[i + 1])
-            if b > a:
-                bands[i] = float(mag_norm[a:b].mean())
-            else:
-                bands[i] = float(mag_norm[a])
-
-        # Noise floor gate
-        bands_db = bands * 80.0 - 80.0
-        bands[bands_db < self._s.noise_floor_db] = 0.0
-
-        self._latest = bands
+            back[0] = bands[k - 1]
+            back[1] = bands[k - 1]
+        self._snap.commit()
+
+        # Drop consumed samples; the next frame starts k hops in
+        consumed = k * self._hop
+        hist[:fill - consumed] = hist[consumed:fill]
+        self._fill = fill - consumed
+
+        self._account(k, time.perf_counter() - t0)
+
+    def _account(self, k: int, dt: float) -> None:
+        self.frames_emitted += k
+        per_frame = dt / k
+        self._cost_ema_s = per_frame if not self._cost_ema_s else 0.9 * self._cost_ema_s + 0.1 * per_frame
+
+        self._fps_frames += k
+        now = time.perf_counter()
+        elapsed = now - self._fps_t0
+        if elapsed >= 1.0:
+            self._fps = self._fps_frames / elapsed
+            self._fps_frames = 0
+            self._fps_t0 = now
+
+    @property
+    def n_bands(self) -> int:
+        return self._n_bands
+
+    @property
+    def seq(self) -> int:
+        """ Sequence number of the latest published frame. """
+        return self._snap.seq
 
     def latest_bands(self) -> np.ndarray:
-        return self._latest.copy()
+        out = np.empty(self._n_bands, dtype=np.float32)
+        self._snap.read_into(out, 0)
+        return out
+
+    def latest_peaks(self) -> np.ndarray:
+        """ Peak-hold markers matching latest_bands() (same as the bands when smoothing is off). """
+        out = np.empty(self._n_bands, dtype=np.float32)
+        self._snap.read_into(out, 1)
+        return out
+
+    def read_bands_into(self, out: np.ndarray) -> int:
+        """ Copy the latest bands into `out` (float32, n_bands); returns their sequence number. """
+        return self._snap.read_into(out, 0)
+
+    def read_into(self, out: np.ndarray) -> int:
+        """ Copy bands and peaks as one (2, n_bands) snapshot; returns its sequence number. """
+        return self._snap.read_into(out)
+
+    def wait_for_new(self, seq: int, timeout: float | None = None) -> int:
+        """ Block until a frame newer than `seq` is published (or timeout); returns the latest seq. """
+        return self._snap.wait_for_new(seq, timeout)
+
+def spectrum_source(audio, settings: Settings, n_bands: int = 48, cache: VizCache | None = None,
+                    clock=None, **worker_args) -> SpectrumWorker | CachedSpectrumSource:
+    """
+    The visualizer's band provider. With a precomputed cache for the playing track (see
+    vizcache.fresh_viz) and a clock to read it by, frames are replayed from the cache;
+    otherwise a live SpectrumWorker is subscribed to `audio`. Both are read the same way.
+    """
+    if cache is not None and clock is not None and cache.n_bands == n_bands and cache.n_frames:
+        return CachedSpectrumSource(cache, clock)
+    return SpectrumWorker(audio, settings, n_bands=n_bands, **worker_args)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import numpy as np
+
+class TornReadError(RuntimeError):
+    """ Raised when the writer lapped a reader while it was copying. """
+
+class SpscRingBuffer:
+    """
+    Single-producer ring of float32 samples without a mutex. Readers are passive (they never
+    store into the ring), so any number of consumer threads can read the latest samples.
+
+    The writer owns two monotonic counters: `_claimed` is bumped before a block is copied in and
+    `_written` after it (each a single int store, atomic under the GIL), so readers never see a
+    count ahead of the data. Readers snapshot `_written`, take views of the most recent N samples,
+    and afterwards call `is_torn(seq, n)`, which compares against `_claimed` to detect whether the
+    writer overwrote (or is currently overwriting) the region they were reading.
+
+    Readers never block the writer: a slow reader gets a torn read and retries instead.
+    """
+    def __init__(self, capacity: int, dtype=np.float32):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._buf = np.zeros(int(capacity), dtype=dtype)
+        self._cap = int(capacity)
+        self._claimed = 0  # monotonic, only ever stored by the writer
+        self._written = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._cap
+
+    @property
+    def written(self) -> int:
+        """ Total samples written since creation / last reset. """
+        return self._written
+
+    # Writer side (single thread, e.g. the PortAudio callback)
+    def write(self, data: np.ndarray) -> int:
+        """ Append samples, overwriting the oldest ones. Returns the new write count. """
+        buf = self._buf
+        cap = self._cap
+        n = data.shape[0]
+        w = self._written
+        self._claimed = w + n
+        if n >= cap:
+            # Only the newest `cap` samples can survive; keep them aligned to their positions
+            data = data[n - cap:]
+            start = (w + n - cap) % cap
+            k = cap - start
+            buf[start:] = data[:k]
+            buf[:start] = data[k:]
+        else:
+            start = w % cap
+            end = start + n
+            if end <= cap:
+                buf[start:end] = data
+            else:
+                k = cap - start
+                buf[start:] = data[:k]
+                buf[:n - k] = data[k:]
+
+        # Publish only after the data is in place
+        self._written = w + n
+        return self._written
+
+    def reset(self) -> None:
+        """ Clear the ring. Only safe while the writer is stopped. """
+        self._buf[:] = 0
+        self._claimed = 0
+        self._written = 0
+
+    # Reader side
+    def latest_views(self, n: int) -> tuple[int, tuple[np.ndarray, ...]]:
+        """
+        Zero-copy views of the most recent `n` samples (oldest first) as one or two slices,
+        plus the write count they were taken at. Fewer samples are returned while the ring is
+        still filling. Check `is_torn(seq, n)` after consuming the views.
+        """
+        seq = self._written
+        n = min(int(n), self._cap, seq)
+        if n <= 0:
+            return seq, ()
+
+        end = seq % self._cap
+        start = end - n
+        if start >= 0:
+            return seq, (self._buf[start:end],)
+        if end == 0:
+            return seq, (self._buf[start:],)
+        return seq, (self._buf[start:], self._buf[:end])
+
+    def is_torn(self, seq: int, n: int) -> bool:
+        """
+        True if the writer may have overwritten any of the `n` samples read at `seq`.
+        The oldest sample read sits at position seq - n; it stays intact until the
+        writer has claimed a whole capacity past it.
+        """
+        return self._claimed - (seq - n) > self._cap
+
+    def read_latest(self, n: int, out: np.ndarray | None = None, retries: int = 3) -> np.ndarray:
+        """
+        Copy the most recent `n` samples into `out` (allocated if None) and validate them.
+        Retries on a torn read and raises TornReadError if every attempt was overrun.
+        """
+        n = min(int(n), self._cap)
+        if out is None:
+            out = np.zeros(n, dtype=self._buf.dtype)
+
+        for _ in range(max(1, retries)):
+            seq, views = self.latest_views(n)
+            got = sum(v.shape[0] for v in views)
+            # Left-pad with zeros while the ring is still filling
+            pos = out.shape[0] - got
+            out[:pos] = 0
+            for v in views:
+                out[pos:pos + v.shape[0]] = v
+                pos += v.shape[0]
+            if not self.is_torn(seq, got):
+                return out
+
+        raise TornReadError(f"reader was overrun {retries} times reading {n} samples")
+
+class SpscSlotRing:
+    """
+    Bounded single-producer / single-consumer queue of (slot, frames) pairs for handing pool
+    slots from the audio callback to the dispatcher thread without a mutex.
+
+    Entries live in two preallocated lists; `push()` stores two ints and bumps the producer
+    count, so the callback takes no lock and builds no tuple. Same publication scheme as
+    SpscRingBuffer: each side only ever stores its own counter (atomic under the GIL), and the
+    producer bumps its count only after the entry is in place.
+    """
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._cap = int(capacity)
+        self._slots = [0] * self._cap
+        self._frames = [0] * self._cap
+        self._pushed = 0  # only stored by the producer
+        self._popped = 0  # only stored by the consumer
+
+    def __len__(self) -> int:
+        return self._pushed - self._popped
+
+    # Producer side (the realtime callback)
+    def push(self, slot: int, frames: int) -> bool:
+        """ Queue an entry; False (nothing stored) when the ring is full. """
+        p = self._pushed
+        if p - self._popped >= self._cap:
+            return False
+        i = p % self._cap
+        self._slots[i] = slot
+        self._frames[i] = frames
+        self._pushed = p + 1
+        return True
+
+    # Consumer side
+    def pop(self) -> tuple[int, int] | None:
+        """ Oldest entry, or None when empty. """
+        c = self._popped
+        if c == self._pushed:
+            return None
+        i = c % self._cap
+        entry = (self._slots[i], self._frames[i])
+        self._popped = c + 1
+        return entry
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from ..core.config import Settings
+
+def _coef(time_ms: float, frame_rate: float) -> float:
+    """ One-pole coefficient for a time constant, as the fraction of the gap closed per frame. """
+    if time_ms <= 0:
+        return 1.0
+    return 1.0 - math.exp(-1000.0 / (time_ms * frame_rate))
+
+class BandSmoother:
+    """
+    Per-band post-processing with state in preallocated arrays:
+        - AGC-style auto normalisation (instant attack, slow release of the loudness envelope)
+        - attack/release smoothing (fast rise, slower fall)
+        - peak-hold markers that hold for `peak_hold_ms` then fall at `peak_fall_per_s`
+    Feed it every emitted frame in order; `values` / `peaks` are then ready to draw.
+    """
+    def __init__(self, n_bands: int, frame_rate: float, attack_ms: float = 15.0,
+                 release_ms: float = 180.0, peak_hold_ms: float = 300.0, peak_fall_per_s: float = 1.5,
+                 agc: bool = False, agc_target: float = 0.9, agc_release_s: float = 3.0,
+                 agc_max_gain: float = 4.0):
+        self.n_bands = int(n_bands)
+        self.frame_rate = float(frame_rate)
+
+        self._up = _coef(attack_ms, frame_rate)
+        self._down = _coef(release_ms, frame_rate)
+        self._hold_frames = int(round(peak_hold_ms / 1000.0 * frame_rate))
+        self._fall = float(peak_fall_per_s) / frame_rate
+
+        self.agc = bool(agc)
+        self._agc_target = float(agc_target)
+        self._agc_down = _coef(agc_release_s * 1000.0, frame_rate)
+        self._agc_max_gain = float(agc_max_gain)
+        self._env = 0.0
+
+        self.values = np.zeros(self.n_bands, dtype=np.float32)
+        self.peaks = np.zeros(self.n_bands, dtype=np.float32)
+        self._age = np.zeros(self.n_bands, dtype=np.int32)
+
+        # Scratch, so process() never allocates
+        self._x = np.zeros(self.n_bands, dtype=np.float32)
+        self._diff = np.zeros(self.n_bands, dtype=np.float32)
+        self._k = np.zeros(self.n_bands, dtype=np.float32)
+        self._rising = np.zeros(self.n_bands, dtype=bool)
+        self._held = np.zeros(self.n_bands, dtype=bool)
+
+    @classmethod
+    def from_settings(cls, settings: Settings, n_bands: int, frame_rate: float) -> "BandSmoother":
+        return cls(n_bands, frame_rate,
+                   attack_ms=settings.smooth_attack_ms,
+                   release_ms=settings.smooth_release_ms,
+                   peak_hold_ms=settings.peak_hold_ms,
+                   peak_fall_per_s=settings.peak_fall_per_s,
+                   agc=settings.agc_enabled,
+                   agc_target=settings.agc_target,
+                   agc_release_s=settings.agc_release_s,
+                   agc_max_gain=settings.agc_max_gain)
+
+    def reset(self) -> None:
+        self.values[:] = 0.0
+        self.peaks[:] = 0.0
+        self._age[:] = 0
+        self._env = 0.0
+
+    def process(self, frames: np.ndarray) -> np.ndarray:
+        """ Advance over one (n_bands,) frame or a (k, n_bands) batch; returns `values`. """
+        if frames.ndim == 1:
+            self._step(frames)
+        else:
+            for frame in frames:
+                self._step(frame)
+        return self.values
+
+    def _step(self, frame: np.ndarray) -> None:
+        x, diff, k = self._x, self._diff, self._k
+        np.copyto(x, frame)
+
+        if self.agc:
+            level = float(x.max())
+            if level > self._env:
+                self._env = level
+            else:
+                self._env += (level - self._env) * self._agc_down
+            gain = min(self._agc_target / max(self._env, 1e-6), self._agc_max_gain)
+            x *= gain
+            np.minimum(x, 1.0, out=x)
+
+        # Attack / release: close a different fraction of the gap depending on direction
+        v = self.values
+        np.subtract(x, v, out=diff)
+        np.greater(diff, 0.0, out=self._rising)
+        k.fill(self._down)
+        np.copyto(k, self._up, where=self._rising)
+        diff *= k
+        v += diff
+
+        # Peak hold: reset on a new high, otherwise age, and fall once held long enough
+        peaks, age, held = self.peaks, self._age, self._held
+        np.greater_equal(v, peaks, out=held)
+        np.copyto(peaks, v, where=held)
+        np.copyto(age, 0, where=held)
+        np.logical_not(held, out=held)
+        np.add(age, 1, out=age, where=held)
+        np.greater(age, self._hold_frames, out=held)
+        np.subtract(peaks, self._fall, out=peaks, where=held)
+        np.maximum(peaks, v, out=peaks)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+class SnapshotBuffer:
+    """
+    Single-writer, many-reader publishing of a fixed-shape array with no per-frame allocation.
+
+    Two preallocated buffers alternate as front/back. The writer fills the back buffer
+    (`begin()` ... `commit()`, or `publish(data)`) and flips it to the front by bumping the
+    sequence number. Readers copy the front with `read_into(out)` seqlock-style: if the writer
+    started overwriting that buffer (two publishes) while they copied, they retry.
+    `wait_for_new(seq, timeout)` lets renderers block until a newer frame than `seq` exists.
+    """
+    def __init__(self, shape: int | tuple[int, ...], dtype=np.float32):
+        self._bufs = (np.zeros(shape, dtype=dtype), np.zeros(shape, dtype=dtype))
+        self._seq = 0  # publishes committed; front buffer is _bufs[_seq & 1]
+        self._writing = 0  # publishes started
+        self._cond = threading.Condition()
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._bufs[0].shape
+
+    # Writer side
+    def begin(self) -> np.ndarray:
+        """ Back buffer to fill in place; call commit() when done. """
+        nxt = self._seq + 1
+        self._writing = nxt
+        return self._bufs[nxt & 1]
+
+    def commit(self) -> int:
+        with self._cond:
+            self._seq = self._writing
+            self._cond.notify_all()
+        return self._seq
+
+    def publish(self, data: np.ndarray) -> int:
+        np.copyto(self.begin(), data)
+        return self.commit()
+
+    # Reader side
+    def read_into(self, out: np.ndarray, index=None, retries: int = 8) -> int:
+        """
+        Copy the current front (or `front[index]`) into `out` without allocating and return
+        the sequence number it belongs to. Gives up retrying after `retries` torn copies and
+        returns the last copy, which is at most one frame mixed.
+        """
+        for _ in range(max(1, retries)):
+            seq = self._seq
+            front = self._bufs[seq & 1]
+            np.copyto(out, front if index is None else front[index])
+            # The buffer we copied is only rewritten by publish number seq + 2
+            if self._writing < seq + 2:
+                return seq
+        return seq
+
+    def wait_for_new(self, seq: int, timeout: float | None = None) -> int:
+        """ Block until a frame newer than `seq` is committed (or timeout); returns the current seq. """
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq != seq, timeout)
+            return self._seq
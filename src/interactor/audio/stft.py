@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from .fft import FFTBackend, create_backend
+
+def normalize_db(mag: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Linear FFT magnitudes -> 0..1 via a dB clamp [-80, 0]. Works in place when `out` is `mag`
+    (or any preallocated float32 array of the same shape).
+    """
+    out = np.add(mag, 1e-10, out=out, dtype=np.float32)
+    np.log10(out, out=out)
+    out *= 20.0
+    np.clip(out, -80.0, 0.0, out=out)
+    out += 80.0
+    out /= 80.0
+    return out
+
+def frame_signal(x: np.ndarray, n_fft: int, hop: int) -> np.ndarray:
+    """
+    (n_frames, n_fft) read-only strided view over a 1-D signal, no copy.
+    Trailing samples that don't fill a whole frame are not included.
+    """
+    x = np.ascontiguousarray(x)
+    if x.shape[0] < n_fft:
+        return np.empty((0, n_fft), dtype=x.dtype)
+    n_frames = 1 + (x.shape[0] - n_fft) // hop
+    step = x.strides[0]
+    return as_strided(x, shape=(n_frames, n_fft), strides=(hop * step, step), writeable=False)
+
+class BatchSpectrum:
+    """
+    Hann-windowed, batched float32 rfft -> 0..1 magnitudes for up to `max_frames` frames per
+    call. Windowed frames go straight into the FFT backend's planned input buffer; nothing is
+    allocated once a plan exists for the batch size.
+
+    Batches run through plans sized to the next power of two (capped at `max_frames`), the
+    unused tail rows are ignored, so odd sizes like a track's last chunk reuse a few plans
+    instead of planning (and with pyFFTW measuring) one per size.
+    """
+    def __init__(self, n_fft: int, max_frames: int, backend: FFTBackend | None = None):
+        self.n_fft = int(n_fft)
+        self.max_frames = max(1, int(max_frames))
+        self.n_bins = self.n_fft // 2 + 1
+        self._fft = backend or create_backend()
+        self._win = np.hanning(self.n_fft).astype(np.float32)
+        self._mag = np.empty((self.max_frames, self.n_bins), dtype=np.float32)
+
+    def plan_frames(self, k: int) -> int:
+        """ Rows of the plan a k-frame batch runs through. """
+        return min(self.max_frames, 1 << max(0, k - 1).bit_length())
+
+    def magnitudes(self, frames: np.ndarray) -> np.ndarray:
+        """ 0..1 magnitudes for a (k <= max_frames, n_fft) block; a view valid until the next call. """
+        k = frames.shape[0]
+        plan = self._fft.plan(self.n_fft, self.plan_frames(k))
+        np.multiply(frames, self._win, out=plan.input[:k])
+        mag = self._mag[:k]
+        np.abs(plan.execute()[:k], out=mag)
+        return normalize_db(mag, out=mag)
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import mmap
+import os
+import time
+from enum import IntEnum
+from pathlib import Path
+
+import numpy as np
+
+from ..media.cache import LRUCache
+
+_MAGIC = b"MIVZ"
+_VERSION = 1
+
+# Fixed little-endian header; band frames follow directly as (n_frames, n_bands)
+_HEADER = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u2"),
+    ("quant", "<u2"),
+    ("sample_rate", "<u4"),
+    ("hop", "<u4"),
+    ("n_fft", "<u4"),
+    ("n_bands", "<u4"),
+    ("n_frames", "<u8"),
+    ("source_mtime_ns", "<u8"),
+    ("source_size", "<u8"),
+])
+
+class Quant(IntEnum):
+    FLOAT16 = 0
+    UINT8 = 1
+
+_QUANT_DTYPE = {Quant.FLOAT16: np.dtype("<f2"), Quant.UINT8: np.dtype("u1")}
+
+def viz_cache_path(album_dir: str | Path, disc: int, track: int) -> Path:
+    """ Where a track's band frames live: beside album.json in the album directory. """
+    return Path(album_dir) / f"disc{int(disc)}_track{int(track):02d}.viz"
+
+def _source_stamp(source: str | Path | None) -> tuple[int, int]:
+    if source is None:
+        return 0, 0
+    st = os.stat(source)
+    return st.st_mtime_ns, st.st_size
+
+def write_viz_cache(path: str | Path, bands: np.ndarray, sample_rate: int, hop: int, n_fft: int,
+                    quant: Quant = Quant.UINT8, source: str | Path | None = None) -> Path:
+    """
+    Write a (n_frames, n_bands) 0..1 band matrix, quantised to uint8 or float16.
+    `source` (the audio file) is stamped into the header so stale caches can be detected.
+    Written to a temp file and renamed into place so readers never see a partial cache.
+    """
+    path = Path(path)
+    quant = Quant(quant)
+    bands = np.asarray(bands, dtype=np.float32)
+    if quant is Quant.UINT8:
+        data = np.rint(np.clip(bands, 0.0, 1.0) * 255.0).astype(np.uint8)
+    else:
+        data = bands.astype("<f2")
+
+    mtime_ns, size = _source_stamp(source)
+    header = np.zeros((), dtype=_HEADER)
+    header["magic"] = _MAGIC
+    header["version"] = _VERSION
+    header["quant"] = int(quant)
+    header["sample_rate"] = int(sample_rate)
+    header["hop"] = int(hop)
+    header["n_fft"] = int(n_fft)
+    header["n_bands"] = data.shape[1]
+    header["n_frames"] = data.shape[0]
+    header["source_mtime_ns"] = mtime_ns
+    header["source_size"] = size
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header.tobytes())
+        f.write(np.ascontiguousarray(data).tobytes())
+    os.replace(tmp, path)
+    return path
+
+class VizCache:
+    """
+    Memory-mapped per-track band frames, looked up by playback time (e.g. AudioClock.time()).
+    Nothing is read up front beyond the header; the OS pages frames in as playback touches them.
+    """
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        header = np.fromfile(self.path, dtype=_HEADER, count=1)
+        if header.size != 1 or header["magic"][0] != _MAGIC:
+            raise ValueError(f"{self.path} is not a visualization cache")
+        h = header[0]
+        if int(h["version"]) != _VERSION:
+            raise ValueError(f"{self.path}: unsupported cache version {int(h['version'])}")
+
+        self.quant = Quant(int(h["quant"]))
+        self.sample_rate = int(h["sample_rate"])
+        self.hop = int(h["hop"])
+        self.n_fft = int(h["n_fft"])
+        self.n_bands = int(h["n_bands"])
+        self.n_frames = int(h["n_frames"])
+        self.source_mtime_ns = int(h["source_mtime_ns"])
+        self.source_size = int(h["source_size"])
+
+        dtype = _QUANT_DTYPE[self.quant]
+        if self.n_frames:
+            self._frames = np.memmap(self.path, dtype=dtype, mode="r",
+                                     offset=_HEADER.itemsize, shape=(self.n_frames, self.n_bands))
+        else:
+            # mmap can't map zero bytes
+            self._frames = np.zeros((0, self.n_bands), dtype=dtype)
+        self._scale = np.float32(1.0 / 255.0) if self.quant is Quant.UINT8 else np.float32(1.0)
+
+    @classmethod
+    def open(cls, path: str | Path) -> "VizCache | None":
+        """ Open a cache if it exists and is readable, else None. """
+        try:
+            return cls(path)
+        except (OSError, ValueError):
+            return None
+
+    @property
+    def duration(self) -> float:
+        return self.n_frames * self.hop / self.sample_rate
+
+    def is_fresh(self, source: str | Path) -> bool:
+        """ True if the cache was built from `source` as it currently is on disk. """
+        try:
+            return _source_stamp(source) == (self.source_mtime_ns, self.source_size)
+        except OSError:
+            return False
+
+    def warm(self) -> None:
+        """ Touch every page of the frames now (e.g. from a prefetcher) so playback never faults them in. """
+        if self.n_frames:
+            step = max(1, mmap.PAGESIZE // self._frames.strides[0])
+            self._frames[::step, 0].sum()
+
+    def frame_index(self, t: float) -> int:
+        """ Frame whose window is centred nearest to time t (clamped to the track). """
+        i = int((t * self.sample_rate - self.n_fft / 2) / self.hop + 0.5)
+        return min(max(i, 0), self.n_frames - 1)
+
+    def bands_at(self, t: float, out: np.ndarray | None = None) -> np.ndarray:
+        """ 0..1 float32 bands for time t, written into `out` when given. """
+        if out is None:
+            out = np.empty(self.n_bands, dtype=np.float32)
+        if self.n_frames == 0:
+            out[:] = 0.0
+            return out
+        np.multiply(self._frames[self.frame_index(t)], self._scale, out=out)
+        return out
+
+# Open caches keyed by (path, mtime, size), shared so a prefetched track's cache is reused on play
+_open: LRUCache[tuple[str, int, int], VizCache] = LRUCache(max_entries=16)
+
+def cached_viz(path: str | Path) -> VizCache | None:
+    """ VizCache.open(), reusing the mapping while the file is unchanged. Thread-safe. """
+    path = str(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _open.get_or_load((path, st.st_mtime_ns, st.st_size), lambda key: VizCache.open(key[0]))
+
+def fresh_viz(album_dir: str | Path, disc: int, track: int, source: str | Path) -> VizCache | None:
+    """ A track's cache (shared through cached_viz), if it exists and was built from `source` as it is now. """
+    cache = cached_viz(viz_cache_path(album_dir, disc, track))
+    return cache if cache is not None and cache.is_fresh(source) else None
+
+class CachedSpectrumSource:
+    """
+    Drop-in for SpectrumWorker during local playback: reads precomputed frames for the
+    current clock position (e.g. AudioClock.time()), so no FFT runs at all. Sequence numbers
+    are cache frame indices. There is no separate peak hold, peaks are the bands.
+    Use audio.processing.spectrum_source() to get one when a usable cache exists.
+    """
+    def __init__(self, cache: VizCache, clock):
+        self._cache = cache
+        self._clock = clock
+
+    @property
+    def n_bands(self) -> int:
+        return self._cache.n_bands
+
+    @property
+    def hop(self) -> int:
+        return self._cache.hop
+
+    @property
+    def seq(self) -> int:
+        return self._cache.frame_index(self._clock.time())
+
+    def latest_bands(self) -> np.ndarray:
+        return self._cache.bands_at(self._clock.time())
+
+    def latest_peaks(self) -> np.ndarray:
+        return self.latest_bands()
+
+    def read_bands_into(self, out: np.ndarray) -> int:
+        """ Like SpectrumWorker.read_bands_into; the returned token is the cache frame index. """
+        t = self._clock.time()
+        self._cache.bands_at(t, out=out)
+        return self._cache.frame_index(t)
+
+    def read_into(self, out: np.ndarray) -> int:
+        """ Bands and peaks as one (2, n_bands) array, like SpectrumWorker.read_into. """
+        seq = self.read_bands_into(out[0])
+        out[1] = out[0]
+        return seq
+
+    def wait_for_new(self, seq: int, timeout: float | None = None) -> int:
+        """ Sleep until the clock reaches a frame other than `seq` (or timeout); returns the current one. """
+        cache = self._cache
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            t = self._clock.time()
+            i = cache.frame_index(t)
+            if i != seq:
+                return i
+            # When frame i + 1 becomes the nearest one (see frame_index)
+            wait = ((i + 0.5) * cache.hop + cache.n_fft / 2) / cache.sample_rate - t
+            wait = max(wait, 0.001)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return i
+                wait = min(wait, remaining)
+            time.sleep(wait)
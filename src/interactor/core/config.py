@@ -1,20 +1,38 @@
 from pathlib import Path
 
-from pydantic import field_validator
+from platformdirs import user_cache_dir
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 
+SPECTRUM_N_FFT = 1024  # FFT size of the live visualizer, spectrum_hop can't exceed it
+
 def _repo_root():
     here = Path(__file__).resolve()
     return here.parents[3] if len(here.parents) >= 4 else here.parent
 
 class Settings(BaseSettings):
     assets_dir: Path = Path('assets/library')
+    cache_dir: Path = Field(default_factory=lambda: Path(user_cache_dir("music-interactor")))
     sample_rate: int = 48000
     blocksize: int = 512
     buffer_size: int = 2048
     audio_device_index: int | None = None
+    album_cache_entries: int = 256
+    album_cache_bytes: int = 0  # 0 = entry limit only
+    icon_cache_bytes: int = 64 * 1024 * 1024  # decoded library grid thumbnails
+    thumb_cache_bytes: int = 256 * 1024 * 1024  # on-disk thumbnail files, 0 = unbounded
     noise_floor_db: float = -60.0
     silence_threshold: float = 0.001
+    spectrum_hop: int = 256
+    fft_backend: str = "auto"
+    smooth_attack_ms: float = 15.0
+    smooth_release_ms: float = 180.0
+    peak_hold_ms: float = 300.0
+    peak_fall_per_s: float = 1.5
+    agc_enabled: bool = False
+    agc_target: float = 0.9
+    agc_release_s: float = 3.0
+    agc_max_gain: float = 4.0
 
     @classmethod
     def from_file(cls,
@@ -31,7 +49,7 @@ class Settings(BaseSettings):
 
         return cls(**{**base, **overrider})
 
-    @field_validator("assets_dir", mode="before")
+    @field_validator("assets_dir", "cache_dir", mode="before")
     @classmethod
     def _normalize_assets_dir(cls, v):
         path = Path(v).expanduser()
@@ -51,4 +69,18 @@ class Settings(BaseSettings):
     def _blk_ok(cls, v: int) -> int:
         if v < 128 or v > 4096 or (v & (v - 1)) != 0:
             raise ValueError('blocksize must be power of two between 128 and 4096')
+        return v
+
+    @field_validator('fft_backend')
+    @classmethod
+    def _fft_ok(cls, v: str) -> str:
+        if v not in ('auto', 'numpy', 'scipy', 'pyfftw'):
+            raise ValueError('fft_backend must be one of auto, numpy, scipy, pyfftw')
+        return v
+
+    @field_validator('spectrum_hop')
+    @classmethod
+    def _hop_ok(cls, v: int) -> int:
+        if v < 32 or v > SPECTRUM_N_FFT:
+            raise ValueError(f'spectrum_hop must be between 32 and {SPECTRUM_N_FFT} samples (the spectrum FFT size)')
         return v
\ No newline at end of file
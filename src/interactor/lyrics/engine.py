@@ -1,29 +1,51 @@
-from bisect import bisect_right
 from .models import LyricsTrack, LyricsLine
+from .timeline import LyricsTimeline
 
 class LyricsEngine:
     def __init__(self):
         self._track: LyricsTrack | None = None
-        self._starts: list[float] = []
+        self._timeline: LyricsTimeline | None = None
 
     def set_track(self, track: LyricsTrack) -> None:
         self._track = track
-        self._starts = [ln.t_start for ln in track.lines]
+        self._timeline = LyricsTimeline(track)
 
-    def current_line(self, t: float) -> LyricsLine | None:
-        if not self._track or not self._starts:
-            return None
+    @property
+    def timeline(self) -> LyricsTimeline | None:
+        return self._timeline
+
+    def current_index(self, t: float) -> int:
+        if self._timeline is None:
+            return -1
+        return self._timeline.line_index(t)
 
-        i = bisect_right(self._starts, t) - 1
-        if i < 0 or i >= len(self._track.lines):
+    def current_line(self, t: float) -> LyricsLine | None:
+        if self._timeline is None:
             return None
-        ln = self._track.lines[i]
-        return ln if t < ln.t_end else None
+        i = self._timeline.line_index(t)
+        return self._track.lines[i] if i >= 0 else None
 
     def progress_in_line(self, t: float) -> float:
-        ln = self.current_line(t)
-        if not ln:
+        if self._timeline is None:
             return 0.0
+        return self._timeline.progress(t)
+
+    # Word level (enhanced LRC), these return ints/floats/existing strings, nothing is
+    # allocated per frame
 
-        dur = max(ln.t_end - ln.t_start, 1e-6)
-        return max(0.0, min(1.0, (t - ln.t_start) / dur))
+    def current_word_index(self, t: float) -> int:
+        """ Position of the word being sung within the current line, -1 if none. """
+        if self._timeline is None:
+            return -1
+        return self._timeline.word_in_line(t)
+
+    def current_word(self, t: float) -> str | None:
+        if self._timeline is None:
+            return None
+        w = self._timeline.word_index(t)
+        return self._timeline.word_text[w] if w >= 0 else None
+
+    def progress_in_word(self, t: float) -> float:
+        if self._timeline is None:
+            return 0.0
+        return self._timeline.word_progress(t)
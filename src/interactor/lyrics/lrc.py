@@ -0,0 +1,157 @@
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from ..media.cache import CacheStats, LRUCache
+from .models import LyricsLine, LyricsTrack, LyricsWords
+
+_word_stamp = re.compile(r"<(\d+:\d+(?:[.:]\d+)?)>")  # <mm:ss.xx>, enhanced LRC
+
+@dataclass(frozen=True)
+class ParsedLRC:
+    """ An .lrc file: its lines (with [offset:] already applied) and its metadata tags. """
+    track: LyricsTrack
+    tags: dict[str, str] = field(default_factory=dict)  # ar, ti, al, by, ... keys lowercased
+    offset: float = 0.0  # seconds the stamps were moved earlier by
+
+EMPTY = ParsedLRC(LyricsTrack(lines=[], duration=0.0))
+
+def parse_stamp(text: str) -> float | None:
+    """ Seconds of `mm:ss`, `mm:ss.xx` or `mm:ss:xx`, or None if `text` isn't a timestamp. """
+    m, sep, rest = text.partition(":")
+    if not sep or not m.isdigit():
+        return None
+    s, sep, frac = rest.replace(":", ".", 1).partition(".")
+    if not s.isdigit() or (sep and not frac.isdigit()):
+        return None
+    v = int(m) * 60 + int(s)
+    if frac:
+        v += int(frac) / 10 ** len(frac)
+    return float(v)
+
+def _split_words(body: str, t_line: float) -> tuple[str, list[float], list[str], float | None]:
+    """
+    Plain text, word start times, words and closing time of a line body like
+    `<00:12.00>Hello <00:12.50>world<00:13.20>`. A tag with no text after it closes the
+    previous word; text before the first tag starts with the line.
+    """
+    parts = _word_stamp.split(body)
+    if len(parts) == 1:
+        return body.strip(), [], [], None
+
+    stamps: list[float] = []
+    words: list[str] = []
+    close = None
+    lead = parts[0].strip()
+    if lead:
+        stamps.append(t_line)
+        words.append(lead)
+    for i in range(1, len(parts), 2):  # [lead, stamp, word, stamp, word, ...]
+        t = parse_stamp(parts[i])
+        word = parts[i + 1].strip()
+        if word:
+            stamps.append(t)
+            words.append(word)
+            close = None
+        else:
+            close = t
+    text = " ".join("".join(parts[::2]).split())
+    return text, stamps, words, close
+
+def parse_lrc(lines: Iterable[str]) -> ParsedLRC:
+    """
+    Parse LRC text one line at a time, each line scanned once left to right.
+
+    Leading `[...]` groups are either timestamps (several per line are fine, the line repeats
+    at each) or, on a line with no timestamp, `[key:value]` metadata. `[offset:ms]` moves every
+    stamp earlier by ms (later if negative) and `[length:mm:ss]` sets the duration and closes
+    the last line. The rest of the line is its text, with optional enhanced LRC word stamps.
+    """
+    tags: dict[str, str] = {}
+    # (start, text, (word starts, words, closing time) or None)
+    entries: list[tuple[float, str, tuple | None]] = []
+    for raw in lines:
+        line = raw.strip()
+        stamps: list[float] = []
+        pos = 0
+        while line.startswith("[", pos):
+            end = line.find("]", pos)
+            if end < 0:
+                break
+            inner = line[pos + 1:end]
+            t = parse_stamp(inner)
+            if t is not None:
+                stamps.append(t)
+            elif stamps:
+                break  # e.g. "[00:12.00][Chorus] ...", the bracket is part of the text
+            else:
+                key, sep, value = inner.partition(":")
+                if sep:
+                    tags[key.strip().lower()] = value.strip()
+            pos = end + 1
+        if not stamps:
+            continue
+
+        text, word_starts, words, close = _split_words(line[pos:], stamps[0])
+        for t in stamps:
+            # Word times are written for the first stamp, a repeated line replays them shifted
+            dt = t - stamps[0]
+            timing = None
+            if words:
+                timing = ([s + dt for s in word_starts], words, None if close is None else close + dt)
+            entries.append((t, text, timing))
+
+    try:
+        offset = int(tags.get("offset", "0")) / 1000.0
+    except ValueError:
+        offset = 0.0
+    length = parse_stamp(tags.get("length", ""))
+
+    # Sort and fill t_end from next line's start; the last line runs to [length:] if given,
+    # otherwise it is left open-ended
+    entries.sort(key=lambda x: x[0])
+    n = len(entries)
+    out: list[LyricsLine] = []
+    for i, (t, text, timing) in enumerate(entries):
+        if i + 1 < n:
+            t_end = entries[i + 1][0]
+        else:
+            t_end = max(length + offset, t) if length else t
+        words = None
+        if timing:
+            word_starts, ws, close = timing
+            if close is None:
+                close = t_end if t_end > t else float("inf")
+            words = LyricsWords.from_stamps([s - offset for s in word_starts], ws, close - offset)
+        out.append(LyricsLine(t_start=t - offset, t_end=t_end - offset, text=text, words=words))
+
+    duration = length if length else (out[-1].t_end if out else 0.0)
+    return ParsedLRC(LyricsTrack(lines=out, duration=duration), tags, offset)
+
+def read_lrc(path: str | Path) -> ParsedLRC:
+    """ Parse an .lrc file, streaming it rather than reading it whole. Missing file -> EMPTY. """
+    try:
+        with open(path, encoding="utf-8-sig", errors="ignore") as f:
+            return parse_lrc(f)
+    except FileNotFoundError:
+        return EMPTY
+
+# Parsed files keyed by (path, mtime, size): an edited file just misses, the stale entry ages out
+_cache: LRUCache[tuple[str, int, int], ParsedLRC] = LRUCache(max_entries=128)
+
+def cached_lrc(path: str | Path) -> ParsedLRC:
+    """
+    read_lrc(), parsed at most once per version of the file. Shared and thread-safe (the queue
+    prefetcher fills it from a worker); treat the result as read-only.
+    """
+    path = str(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return EMPTY
+    return _cache.get_or_load((path, st.st_mtime_ns, st.st_size), lambda key: read_lrc(key[0]))
+
+def cache_stats() -> CacheStats:
+    return _cache.stats()
@@ -1,11 +1,37 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import numpy as np
+
+@dataclass(frozen=True, eq=False)
+class LyricsWords:
+    """ Word timings of one line (enhanced LRC), as parallel arrays rather than a tuple per word. """
+    starts: np.ndarray  # float64 seconds
+    ends: np.ndarray  # float64 seconds
+    text: tuple[str, ...]
+
+    @classmethod
+    def from_stamps(cls, stamps: list[float], text: list[str], end: float) -> "LyricsWords":
+        """ Each word runs until the next one starts, the last one until `end`. """
+        starts = np.array(stamps, dtype=np.float64)
+        ends = np.empty_like(starts)
+        ends[:-1] = starts[1:]
+        if len(ends):
+            ends[-1] = max(end, starts[-1])
+        return cls(starts, ends, tuple(text))
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __iter__(self) -> Iterator[tuple[float, float, str]]:
+        return zip(self.starts.tolist(), self.ends.tolist(), self.text)
 
 @dataclass(frozen=True)
 class LyricsLine:
     t_start: float
     t_end: float
     text: str
-    words: list(tuple(float, float, str)) | None = None
+    words: LyricsWords | None = field(default=None, compare=False)
 
 @dataclass(frozen=True)
 class LyricsTrack:
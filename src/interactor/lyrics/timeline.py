@@ -0,0 +1,140 @@
+from bisect import bisect_right
+
+import numpy as np
+
+from .models import LyricsTrack
+
+class _Cursor:
+    """
+    Position lookup over sorted intervals that remembers where the last call landed and the
+    span of times that answer stays good for. The common case (same interval as last frame,
+    or the next one) is a couple of float compares; seeks and long jumps fall back to bisect.
+    """
+    MAX_STEPS = 4  # intervals walked forward before giving up and bisecting
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        # Plain-float copies, indexing a list beats boxing numpy scalars on the per-frame path
+        self._starts = starts.tolist()
+        self._ends = ends.tolist()
+        # The last interval starting at or before t (-1 before the first), valid for
+        # lo <= t < hi, and that interval's start/end
+        self.pos = -1
+        self._lo = -np.inf
+        self._hi = self._starts[0] if self._starts else np.inf
+        self.start = 0.0
+        self.end = -np.inf
+
+    def index(self, t: float) -> int:
+        if not (self._lo <= t < self._hi):
+            self._move(t)
+        return self.pos if t < self.end else -1
+
+    def progress(self, t: float) -> float:
+        if not (self._lo <= t < self._hi):
+            self._move(t)
+        if t >= self.end:
+            return 0.0
+        dur = max(self.end - self.start, 1e-6)
+        return max(0.0, min(1.0, (t - self.start) / dur))
+
+    def _move(self, t: float) -> None:
+        starts = self._starts
+        n = len(starts)
+        pos = self.pos
+        if t >= self._hi:
+            # Playing forward, usually into the very next interval
+            for _ in range(self.MAX_STEPS):
+                pos += 1
+                if pos + 1 >= n or starts[pos + 1] > t:
+                    break
+            else:
+                pos = bisect_right(starts, t) - 1
+        else:
+            pos = bisect_right(starts, t) - 1
+
+        self.pos = pos
+        self._hi = starts[pos + 1] if pos + 1 < n else np.inf
+        if pos < 0:
+            self._lo, self.start, self.end = -np.inf, 0.0, -np.inf
+        else:
+            self._lo = self.start = starts[pos]
+            self.end = self._ends[pos]
+
+def _intervals_at(starts: np.ndarray, ends: np.ndarray, times: np.ndarray) -> np.ndarray:
+    times = np.asarray(times, dtype=np.float64)
+    idx = np.searchsorted(starts, times, side="right") - 1
+    shown = idx >= 0
+    shown[shown] = times[shown] < ends[idx[shown]]
+    return np.where(shown, idx, -1)
+
+class LyricsTimeline:
+    """
+    A LyricsTrack compiled for playback-time lookups. Line starts/ends and word timings live
+    in NumPy arrays; words of all lines are flattened, word k of line i is
+    `word_starts[line_words[i] + k]`.
+
+    `line_index(t)` / `word_index(t)` keep a cursor each (see _Cursor), so steady playback
+    costs O(1) per frame and seeks a bisect. `lines_at(times)` / `words_at(times)` answer a
+    whole array of times at once without touching the cursors.
+
+    Lines must be sorted by t_start, as the providers return them.
+    """
+    def __init__(self, track: LyricsTrack):
+        lines = track.lines
+        n = len(lines)
+        self.starts = np.fromiter((ln.t_start for ln in lines), dtype=np.float64, count=n)
+        self.ends = np.fromiter((ln.t_end for ln in lines), dtype=np.float64, count=n)
+        if n and self.ends[-1] <= self.starts[-1]:
+            self.ends[-1] = np.inf  # last line without an end stays up
+
+        counts = np.fromiter((len(ln.words or ()) for ln in lines), dtype=np.int32, count=n)
+        self.line_words = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(counts, out=self.line_words[1:])
+        worded = [ln.words for ln in lines if ln.words]
+        if worded:
+            self.word_starts = np.concatenate([w.starts for w in worded])
+            self.word_ends = np.concatenate([w.ends for w in worded])
+        else:
+            self.word_starts = np.empty(0, dtype=np.float64)
+            self.word_ends = np.empty(0, dtype=np.float64)
+        self.word_text: list[str] = [s for w in worded for s in w.text]
+        # Flat word index -> position within its line, for highlighting the first k words
+        self._word_pos: list[int] = [k for w in worded for k in range(len(w))]
+
+        self._lines = _Cursor(self.starts, self.ends)
+        self._words = _Cursor(self.word_starts, self.word_ends)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def has_words(self) -> bool:
+        return bool(self.word_text)
+
+    def line_index(self, t: float) -> int:
+        """ Index of the line showing at `t`, or -1 (before the first line or between lines). """
+        return self._lines.index(t)
+
+    def progress(self, t: float) -> float:
+        """ How far through the line showing at `t` playback is, 0..1 (0 when none is). """
+        return self._lines.progress(t)
+
+    def word_index(self, t: float) -> int:
+        """ Flat index of the word being sung at `t`, or -1. """
+        return self._words.index(t)
+
+    def word_in_line(self, t: float) -> int:
+        """ Position of the word being sung at `t` within its line, or -1. """
+        w = self._words.index(t)
+        return self._word_pos[w] if w >= 0 else -1
+
+    def word_progress(self, t: float) -> float:
+        return self._words.progress(t)
+
+    def lines_at(self, times: np.ndarray) -> np.ndarray:
+        """ line_index() for every element of `times` (any order). """
+        return _intervals_at(self.starts, self.ends, times)
+
+    def words_at(self, times: np.ndarray) -> np.ndarray:
+        """ word_index() for every element of `times` (any order). """
+        return _intervals_at(self.word_starts, self.word_ends, times)
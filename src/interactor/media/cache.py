@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+@dataclass(frozen=True)
+class CacheStats:
+    entries: int
+    nbytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread-safe least-recently-used cache bounded by entry count and/or a byte budget
+    (as measured by `sizeof`). A limit of 0 means unbounded on that axis.
+    Safe to fill from a background prefetcher while the UI thread reads.
+    """
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0,
+                 sizeof: Callable[[V], int] | None = None):
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self._sizeof = sizeof or (lambda v: 0)
+        self._data: OrderedDict[K, tuple[V, int]] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def peek(self, key: K) -> V | None:
+        """ Look up without touching recency or counters. """
+        with self._lock:
+            item = self._data.get(key)
+            return item[0] if item else None
+
+    def put(self, key: K, value: V) -> None:
+        size = int(self._sizeof(value))
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            self._data[key] = (value, size)
+            self._nbytes += size
+            self._evict()
+
+    def get_or_load(self, key: K, loader: Callable[[K], V]) -> V:
+        """ Cached value, or load it (outside the lock, so slow loads don't block readers) and cache it. """
+        value = self.get(key)
+        if value is None:
+            value = loader(key)
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def pop(self, key: K) -> V | None:
+        with self._lock:
+            item = self._data.pop(key, None)
+            if item is None:
+                return None
+            self._nbytes -= item[1]
+            return item[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
+
+    def _evict(self) -> None:
+        # Caller holds the lock; never evict the entry just inserted
+        while len(self._data) > 1 and (
+                (self.max_entries and len(self._data) > self.max_entries)
+                or (self.max_bytes and self._nbytes > self.max_bytes)):
+            _, (_, size) = self._data.popitem(last=False)
+            self._nbytes -= size
+            self.evictions += 1
+
+    def keys(self) -> list[K]:
+        """ Snapshot of the keys, least recently used first. """
+        with self._lock:
+            return list(self._data.keys())
+
+    def __contains__(self, key: K) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(entries=len(self._data), nbytes=self._nbytes, hits=self.hits,
+                              misses=self.misses, evictions=self.evictions)
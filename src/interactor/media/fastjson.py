@@ -0,0 +1,56 @@
+import json
+import os
+from typing import Any
+
+from pydantic import TypeAdapter
+from .models import Track
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+_TRACKS = TypeAdapter(list[Track])
+
+def _pick(name: str) -> str:
+    if name == "auto":
+        return "msgspec" if msgspec else ("orjson" if orjson else "pydantic")
+    if name == "msgspec" and msgspec is None or name == "orjson" and orjson is None:
+        return _pick("auto")
+    return name if name in ("msgspec", "orjson", "pydantic") else "pydantic"
+
+# INTERACTOR_JSON=pydantic forces the reference path (stdlib json + pydantic validation)
+backend = _pick(os.environ.get("INTERACTOR_JSON", "auto"))
+
+def set_backend(name: str) -> str:
+    """ Switch decode path (auto / msgspec / orjson / pydantic); returns the one actually used. """
+    global backend
+    backend = _pick(name)
+    return backend
+
+class DecodeError(ValueError):
+    """ Malformed JSON, raised by loads() whichever backend is active. """
+
+def loads(raw: bytes | str) -> Any:
+    """ json.loads, through orjson or msgspec when installed. """
+    try:
+        if backend == "msgspec":
+            return msgspec.json.decode(raw)
+        if backend == "orjson":
+            return orjson.loads(raw)
+        return json.loads(raw)
+    except ValueError as e:
+        # json/orjson decode errors, msgspec.DecodeError and bad UTF-8 are all ValueErrors
+        raise DecodeError(str(e)) from e
+
+def validate_tracks(raw_tracks: list) -> list[Track]:
+    """
+    Parsed track dicts into Track models, on every backend through pydantic's compiled
+    validator: converting to msgspec structs first and then into Tracks only adds a copy.
+    """
+    return _TRACKS.validate_python(raw_tracks)
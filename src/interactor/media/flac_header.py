@@ -0,0 +1,114 @@
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+_STREAMINFO = 0
+_VORBIS_COMMENT = 4
+_MAX_COMMENT_BYTES = 16 * 1024 * 1024  # anything bigger is not a tag block we want to hold in memory
+
+class FlacHeaderError(Exception):
+    pass
+
+@dataclass(frozen=True)
+class StreamInfo:
+    """ The STREAMINFO fields metadata_gen and the analyzers use, named like mutagen's. """
+    sample_rate: int
+    channels: int
+    bits_per_sample: int
+    total_samples: int
+
+    @property
+    def length(self) -> float:
+        return self.total_samples / self.sample_rate if self.sample_rate else 0.0
+
+class FlacTags:
+    """
+    Vorbis comments plus stream info, read the way code reads a mutagen FLAC:
+    `tags["TITLE"][0]`, `tags.get("COMPOSER", [...])`, `tags.info.length`. Keys are case-insensitive.
+    """
+    def __init__(self, info: StreamInfo, comments: dict[str, list[str]]):
+        self.info = info
+        self._comments = comments
+
+    def __getitem__(self, key: str) -> list[str]:
+        return self._comments[key.upper()]
+
+    def get(self, key: str, default=None):
+        return self._comments.get(key.upper(), default)
+
+    def __contains__(self, key: str) -> bool:
+        return key.upper() in self._comments
+
+    def keys(self):
+        return self._comments.keys()
+
+def read_flac_tags(path: str | Path, buffer_size: int = 64 * 1024) -> FlacTags:
+    """
+    Read STREAMINFO and VORBIS_COMMENT from a FLAC's metadata blocks. Other blocks (PICTURE,
+    PADDING, SEEKTABLE, ...) are seeked over rather than read, so embedded art costs nothing,
+    and reading stops as soon as both blocks have been seen.
+    """
+    info = comments = None
+    with open(path, "rb", buffering=buffer_size) as f:
+        if f.read(4) != b"fLaC":
+            raise FlacHeaderError(f"{path} does not start with a FLAC stream marker")
+        last = False
+        while not last and (info is None or comments is None):
+            header = f.read(4)
+            if len(header) != 4:
+                raise FlacHeaderError(f"{path} ends inside its metadata blocks")
+            last = bool(header[0] & 0x80)
+            kind = header[0] & 0x7F
+            size = int.from_bytes(header[1:], "big")
+
+            if kind == _STREAMINFO:
+                info = _parse_streaminfo(f.read(size))
+            elif kind == _VORBIS_COMMENT:
+                if size > _MAX_COMMENT_BYTES:
+                    raise FlacHeaderError(f"{path} has an oversized comment block ({size} bytes)")
+                comments = _parse_comments(f.read(size))
+            else:
+                f.seek(size, 1)
+
+    if info is None:
+        raise FlacHeaderError(f"{path} has no STREAMINFO block")
+    return FlacTags(info, comments or {})
+
+def open_flac(path: str | Path):
+    """ Header-only tags for metadata_gen; files the fast reader rejects go through mutagen. """
+    try:
+        return read_flac_tags(path)
+    except (FlacHeaderError, struct.error, UnicodeDecodeError, ValueError):
+        from mutagen.flac import FLAC
+        return FLAC(path)
+
+def _parse_streaminfo(block: bytes) -> StreamInfo:
+    if len(block) < 18:
+        raise FlacHeaderError("truncated STREAMINFO")
+    # After min/max block size (2+2) and min/max frame size (3+3):
+    # 20 bits sample rate, 3 bits channels-1, 5 bits bits-per-sample-1, 36 bits total samples
+    packed = int.from_bytes(block[10:18], "big")
+    return StreamInfo(sample_rate=packed >> 44,
+                      channels=((packed >> 41) & 0x7) + 1,
+                      bits_per_sample=((packed >> 36) & 0x1F) + 1,
+                      total_samples=packed & 0xFFFFFFFFF)
+
+def _parse_comments(block: bytes) -> dict[str, list[str]]:
+    # Vorbis comment lengths are little-endian, unlike the FLAC block headers
+    (vendor_len,) = struct.unpack_from("<I", block, 0)
+    pos = 4 + vendor_len
+    (count,) = struct.unpack_from("<I", block, pos)
+    pos += 4
+
+    comments: dict[str, list[str]] = {}
+    for _ in range(count):
+        (n,) = struct.unpack_from("<I", block, pos)
+        pos += 4
+        entry = block[pos:pos + n]
+        if len(entry) != n:
+            raise FlacHeaderError("truncated comment")
+        pos += n
+        key, sep, value = entry.decode("utf-8").partition("=")
+        if sep:
+            comments.setdefault(key.upper(), []).append(value)
+    return comments
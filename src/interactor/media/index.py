@@ -0,0 +1,226 @@
+import json
+import sqlite3
+import threading
+import time
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .models import AlbumSummary
+from .scanner import LibraryScanner
+
+_SCHEMA_VERSION = 4
+_FLUSH_EVERY = 256  # parsed albums per write, so a cold scan becomes queryable as it goes
+_HAS_ID = "album_id IS NOT NULL AND album_id != ''"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS albums (
+    dir TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    album_id TEXT,
+    album_title TEXT,
+    album_artist TEXT,
+    release_year TEXT,
+    cover TEXT,
+    raw BLOB
+);
+CREATE INDEX IF NOT EXISTS albums_by_id ON albums(album_id, dir);
+"""
+
+@dataclass(frozen=True)
+class RefreshStats:
+    scanned: int
+    parsed: int
+    removed: int
+    failed: int
+    elapsed_s: float
+    cold: bool  # index was empty, so every album had to be parsed
+    removed_ids: tuple[str, ...] = ()  # album_ids of the removed albums, for dropping them from caches
+
+    def __str__(self) -> str:
+        kind = "cold" if self.cold else "warm"
+        return (f"{kind} refresh: {self.scanned} albums, {self.parsed} parsed, {self.removed} removed, "
+                f"{self.failed} failed in {self.elapsed_s * 1000:.1f} ms")
+
+_SUMMARY_COLS = "dir, album_id, album_title, album_artist, release_year, cover"
+
+def _summary(row: tuple) -> AlbumSummary | None:
+    d, album_id, title, artist, year, cover = row
+    if not album_id:
+        return None
+    # Trusted, already-typed columns, skip validation
+    return AlbumSummary.model_construct(album_id=album_id, album_title=title or Path(d).name, album_artist=artist,
+                                        release_year=str(year) if year is not None else None,
+                                        album_dir=Path(d), cover=Path(cover) if cover else None)
+
+class LibraryIndex:
+    """
+    Persistent SQLite index of album directories keyed by the album.json (mtime, size) stamp.
+    `refresh()` only re-parses album.json files whose stamp changed and drops rows for albums
+    that disappeared, so a warm start costs one stat per album instead of a full parse.
+    The walk itself is fanned out over a LibraryScanner thread pool. Rows double as the
+    AlbumSummary source and keep the raw album.json bytes, so nothing parses a file twice.
+    """
+    def __init__(self, path: str | Path, scanner: LibraryScanner | None = None):
+        self.path = Path(path)
+        self.scanner = scanner or LibraryScanner()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        with self._lock, self._db:
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                # Derived data only, just rebuild it
+                self._db.execute("DROP TABLE IF EXISTS albums")
+                self._db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def refresh(self, root: str | Path,
+                on_album: Callable[[AlbumSummary, bool], None] | None = None) -> RefreshStats:
+        """
+        Bring the index in line with `root`. `on_album(summary, changed)` is called for every
+        album as the scanner reports it (completion order, from this thread), so a caller can
+        show albums before the walk has finished.
+        """
+        t0 = time.perf_counter()
+        with self._lock:
+            rows = self._db.execute(f"SELECT mtime_ns, size, {_SUMMARY_COLS} FROM albums").fetchall()
+        known = {r[2]: (r[0], r[1]) for r in rows}
+        known_rows = {r[2]: r[2:] for r in rows}
+        cold = not known
+
+        seen: set[str] = set()
+        upserts: list[tuple] = []
+        covers: list[tuple] = []
+        parsed = failed = 0
+        for res in self.scanner.scan(root, known):
+            key = str(res.album_dir)
+            cover = str(res.cover) if res.cover else None
+            if res.error is not None:
+                warnings.warn(f"Had to skip {res.album_dir / 'album.json'}: {res.error}")
+                failed += 1
+                continue
+            seen.add(key)
+
+            if not res.changed:
+                row = known_rows[key]
+                if cover != row[-1]:
+                    covers.append((cover, key))
+                    row = (*row[:-1], cover)
+                summary = _summary(row)
+                if on_album and summary:
+                    on_album(summary, False)
+                continue
+
+            data = res.data
+            if not data.get("album_id"):
+                warnings.warn(f"No album id found in {res.album_dir / 'album.json'}")
+            row = (key, data.get("album_id"), data.get("album_title"), data.get("album_artist"),
+                   data.get("release_year"), cover)
+            upserts.append((res.mtime_ns, res.size, *row, res.raw))
+            parsed += 1
+            if len(upserts) >= _FLUSH_EVERY:
+                self._write(upserts, covers)
+                upserts, covers = [], []
+            summary = _summary(row)
+            if on_album and summary:
+                on_album(summary, True)
+
+        removed = [(d,) for d in known.keys() - seen]
+        self._write(upserts, covers, removed)
+        removed_ids = tuple(known_rows[d][1] for (d,) in removed if known_rows[d][1])
+
+        return RefreshStats(scanned=len(seen), parsed=parsed, removed=len(removed),
+                            failed=failed, elapsed_s=time.perf_counter() - t0, cold=cold,
+                            removed_ids=removed_ids)
+
+    def _write(self, upserts: list[tuple], covers: list[tuple], removed: list[tuple] = ()) -> None:
+        with self._lock, self._db:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO albums (mtime_ns, size, {_SUMMARY_COLS}, raw) "
+                f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", upserts)
+            self._db.executemany("UPDATE albums SET cover = ? WHERE dir = ?", covers)
+            self._db.executemany("DELETE FROM albums WHERE dir = ?", removed)
+
+    def summaries(self) -> list[AlbumSummary]:
+        """ Every indexed album that has an id, sorted by album_id. """
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_SUMMARY_COLS} FROM albums WHERE {_HAS_ID} ORDER BY album_id, dir").fetchall()
+        return list(map(_summary, rows))
+
+    def summaries_after(self, after: AlbumSummary | None, limit: int) -> list[AlbumSummary]:
+        """
+        One page of summaries in album_id order, starting after `after` (None for the first page).
+        Keyset paging on the (album_id, dir) index, so deep pages cost the same as the first.
+        """
+        with self._lock:
+            if after is None:
+                rows = self._db.execute(
+                    f"SELECT {_SUMMARY_COLS} FROM albums WHERE {_HAS_ID} "
+                    f"ORDER BY album_id, dir LIMIT ?", (limit,)).fetchall()
+            else:
+                rows = self._db.execute(
+                    f"SELECT {_SUMMARY_COLS} FROM albums WHERE {_HAS_ID} AND (album_id, dir) > (?, ?) "
+                    f"ORDER BY album_id, dir LIMIT ?", (after.album_id, str(after.album_dir), limit)).fetchall()
+        return list(map(_summary, rows))
+
+    def summaries_for(self, album_ids: Iterable[str]) -> list[AlbumSummary]:
+        """ Summaries of the given albums in one query, in album_id order (unknown ids are skipped). """
+        ids = json.dumps(list(album_ids))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_SUMMARY_COLS} FROM albums WHERE {_HAS_ID} AND "
+                f"album_id IN (SELECT value FROM json_each(?)) ORDER BY album_id, dir", (ids,)).fetchall()
+        return list(map(_summary, rows))
+
+    def summary(self, album_id: str | None = None, album_dir: str | Path | None = None) -> AlbumSummary | None:
+        """ Look one album up by id or by directory. """
+        with self._lock:
+            if album_dir is not None:
+                row = self._db.execute(f"SELECT {_SUMMARY_COLS} FROM albums WHERE dir = ? AND {_HAS_ID}",
+                                       (str(album_dir),)).fetchone()
+            else:
+                row = self._db.execute(f"SELECT {_SUMMARY_COLS} FROM albums WHERE album_id = ? LIMIT 1",
+                                       (album_id,)).fetchone()
+        return _summary(row) if row else None
+
+    def count(self) -> int:
+        """ Albums with an id, i.e. what the library shows. """
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM albums WHERE {_HAS_ID}").fetchone()[0]
+
+    def album_id_at(self, position: int) -> str | None:
+        """ The album_id at `position` in album_id order (for picking one at random). """
+        with self._lock:
+            row = self._db.execute(f"SELECT album_id FROM albums WHERE {_HAS_ID} "
+                                   f"ORDER BY album_id, dir LIMIT 1 OFFSET ?", (position,)).fetchone()
+        return row[0] if row else None
+
+    def stamps(self) -> dict[str, tuple[str, int, int]]:
+        """ album_id -> (dir, mtime_ns, size) for every album with an id. """
+        with self._lock:
+            rows = self._db.execute(f"SELECT album_id, dir, mtime_ns, size FROM albums WHERE {_HAS_ID}").fetchall()
+        return {album_id: (d, m, s) for album_id, d, m, s in rows}
+
+    def raws(self, album_dirs: Iterable[str | Path]) -> dict[str, bytes]:
+        """ raw() for many albums in one query, dir -> bytes. """
+        dirs = json.dumps([str(d) for d in album_dirs])
+        with self._lock:
+            rows = self._db.execute("SELECT dir, raw FROM albums WHERE raw IS NOT NULL AND "
+                                    "dir IN (SELECT value FROM json_each(?))", (dirs,)).fetchall()
+        return dict(rows)
+
+    def raw(self, album_dir: str | Path) -> bytes | None:
+        """ album.json bytes as of the last refresh. """
+        with self._lock:
+            row = self._db.execute("SELECT raw FROM albums WHERE dir = ?", (str(album_dir),)).fetchone()
+        return row[0] if row else None
@@ -1,9 +1,8 @@
 from dataclasses import dataclass
 from pathlib import Path
 from bisect import bisect_right
-import re
 
-_timestamp = re.compile(r"\[(\d{1,2}):(\d{1,2})(?:\.(\d{1,3}))?\]")
+from ..lyrics.lrc import cached_lrc
 
 @dataclass(frozen=True)
 class LyricLine:
@@ -17,23 +16,10 @@ class LRC:
 
     @staticmethod
     def load(path: Path | None) -> "LRC":
-        if not path or not path.exists():
+        if not path:
             return LRC([])
-
-        out: list[LyricLine] = []
-        for raw in path.read_text(encoding='utf-8', errors='ignore').splitlines():
-            tags = list(_timestamp.finditer(raw))
-            if not tags:
-                continue
-
-            text = _timestamp.sub("", raw).strip()
-
-            for m in tags:
-                mm, ss, ms = m.groups()
-                t = int(mm) * 60 + int(ss) + (int(ms) / (1000 if ms else 1))
-                out.append(LyricLine(t=t, text=text))
-
-        return LRC(out)
+        track = cached_lrc(path).track
+        return LRC([LyricLine(ts=ln.t_start, text=ln.text) for ln in track.lines])
 
     def current(self, t: float) -> tuple[int, str]:
         if not self.lines:
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field, field_validator
+from pathlib import Path
+from typing import Any
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_serializer, field_validator
 
 class Track(BaseModel):
     track_title: str
@@ -27,14 +29,54 @@ class Track(BaseModel):
         except Exception:
             return 0
 
+class AlbumSummary(BaseModel):
+    """ What the library grid needs, straight from the index without touching album.json. """
+    album_id: str
+    album_title: str
+    album_artist: str | None = None
+    release_year: str | None = None
+    album_dir: Path
+    cover: Path | None = None
+
 class Album(BaseModel):
+    """
+    Full album. Tracks are kept as parsed JSON and only validated the first time `tracks`
+    is read, so building an Album just to show its header stays cheap.
+    Dumps still carry the validated tracks under `tracks`.
+    """
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
     album_id: str
     album_title: str
     album_artist: str
     release_year: str
     disc_total: int
     track_total: int
-    tracks: list[Track]
+    alt_art: dict[str, Any] | None = None  # animated_cover and per-track art, absolute paths
+    raw_tracks: list[Any] = Field(default_factory=list, alias='tracks', repr=False)
+
+    _tracks: list[Track] | None = PrivateAttr(default=None)
+
+    @field_validator('alt_art', mode='before')
+    @classmethod
+    def _no_alt_art(cls, v):
+        # Older album.json files write an empty list when there is none
+        return v if isinstance(v, dict) else None
+
+    @property
+    def tracks(self) -> list[Track]:
+        if self._tracks is None:
+            from .fastjson import validate_tracks  # builds on these models
+            self._tracks = validate_tracks(self.raw_tracks)
+        return self._tracks
+
+    @field_serializer('raw_tracks')
+    def _dump_tracks(self, _raw, info):
+        return [t.model_dump(mode=info.mode) for t in self.tracks]
+
+    @property
+    def tracks_loaded(self) -> bool:
+        return self._tracks is not None
 
     def sorted_tracks(self) -> list[Track]:
         return sorted(self.tracks, key=lambda t: (t.disc, t.track))
@@ -0,0 +1,83 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from . import fastjson
+
+EXAMPLE_DIR = "ARTIST - ALBUM (YEAR)"
+
+@dataclass(frozen=True)
+class ScanResult:
+    album_dir: Path
+    mtime_ns: int
+    size: int
+    cover: Path | None
+    data: dict | None = None  # parsed album.json, None when unchanged (or failed)
+    raw: bytes | None = None  # the bytes `data` was parsed from
+    error: str | None = None
+
+    @property
+    def changed(self) -> bool:
+        return self.data is not None
+
+class LibraryScanner:
+    """
+    Walks a library root with a bounded thread pool. Each album directory is listed once with
+    os.scandir, which yields album.json and cover.jpg together (no separate exists() calls),
+    and album.json is only read and parsed when its (mtime, size) differs from `known`.
+    Results stream back as they complete, so callers can show albums progressively.
+    """
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max(1, int(max_workers))
+
+    def scan(self, root: str | Path, known: dict[str, tuple[int, int]] | None = None) -> Iterator[ScanResult]:
+        root = Path(root)
+        known = known or {}
+        try:
+            with os.scandir(root) as it:
+                album_dirs = [e.path for e in it if e.name != EXAMPLE_DIR and e.is_dir()]
+        except OSError:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scan") as pool:
+            futures = [pool.submit(_probe, path, known.get(path)) for path in album_dirs]
+            for fut in as_completed(futures):
+                res = fut.result()
+                if res is not None:
+                    yield res
+
+def _probe(album_dir: str, known_stamp: tuple[int, int] | None) -> ScanResult | None:
+    album_json = cover = None
+    try:
+        with os.scandir(album_dir) as it:
+            for e in it:
+                if e.name == "album.json":
+                    album_json = e
+                elif e.name == "cover.jpg":
+                    cover = Path(e.path)
+    except OSError:
+        return None
+    if album_json is None:
+        return None
+
+    try:
+        st = album_json.stat()
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    base = dict(album_dir=Path(album_dir), mtime_ns=stamp[0], size=stamp[1], cover=cover)
+    if stamp == known_stamp:
+        return ScanResult(**base)
+
+    try:
+        with open(album_json.path, "rb") as f:
+            raw = f.read()
+        data = fastjson.loads(raw)
+    except Exception as e:
+        return ScanResult(**base, error=repr(e))
+    if not isinstance(data, dict):
+        # Valid JSON but not an album (e.g. a bare list), the index only knows how to read objects
+        return ScanResult(**base, error=f"expected a JSON object, got {type(data).__name__}")
+    return ScanResult(**base, data=data, raw=raw)
@@ -0,0 +1,199 @@
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from typing import Iterable
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+
+def normalize(text: str) -> str:
+    """ Case- and accent-insensitive form used for both indexing and queries. """
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+def tokenize(text: str) -> list[str]:
+    return _WORD.findall(normalize(text))
+
+def album_tokens(data: dict) -> set[str]:
+    """ Searchable words of an album.json: album title/artist and every track's title and credits. """
+    fields: list[str] = [data.get("album_title") or "", data.get("album_artist") or ""]
+    for t in data.get("tracks") or ():
+        if not isinstance(t, dict):
+            continue
+        fields.append(t.get("track_title") or "")
+        for key in ("track_artist", "composer", "lyricist"):
+            fields.extend(t.get(key) or ())
+    tokens: set[str] = set()
+    for f in fields:
+        if isinstance(f, str):
+            tokens.update(tokenize(f))
+    return tokens
+
+def _trigrams(token: str) -> set[str]:
+    # Padded like pg_trgm, so word starts and ends count and short words still have a few
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SearchIndex:
+    """
+    In-memory inverted index over album and track metadata, one document per album.
+
+    - Every word maps to a bitset (a Python int) of the albums it occurs in, so AND/OR of
+      postings is a single C-level big-int operation.
+    - The top SHORT_PREFIX levels of the prefix trie are materialised as bitsets; longer
+      prefixes are a bisect range over the sorted vocabulary (the deeper trie levels).
+    - Words with no prefix match fall back to trigram postings (typo tolerance).
+
+    Every query word is treated as a prefix, so results narrow as the user types.
+    Albums can be added, replaced and removed one at a time; a lock makes it safe to update
+    from a worker while the UI queries.
+    """
+    SHORT_PREFIX = 3
+    FUZZY_MIN_SIMILARITY = 0.5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: list[str | None] = []  # doc number -> album_id
+        self._id_array = np.empty(0, dtype=object)  # same, for fancy indexing, rebuilt lazily
+        self._doc_of: dict[str, int] = {}
+        self._free: list[int] = []
+        self._doc_tokens: dict[int, set[str]] = {}
+        self._stamps: dict[str, object] = {}
+
+        self._postings: dict[str, int] = {}
+        self._short: dict[str, int] = {}
+        self._trigrams: dict[str, set[str]] = {}
+        self._vocab: list[str] = []
+        self._vocab_dirty = False
+        self._ids_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def album_ids(self) -> set[str]:
+        with self._lock:
+            return set(self._doc_of)
+
+    def stamp(self, album_id: str):
+        """ Whatever was passed as `stamp` when the album was last added, to detect changes. """
+        return self._stamps.get(album_id)
+
+    def add(self, album_id: str, data: dict, stamp=None) -> None:
+        """ Index (or re-index) one album from its album.json contents. """
+        tokens = album_tokens(data)
+        with self._lock:
+            self._remove(album_id)
+            doc = self._free.pop() if self._free else len(self._ids)
+            if doc == len(self._ids):
+                self._ids.append(album_id)
+            else:
+                self._ids[doc] = album_id
+            self._ids_dirty = True
+            self._doc_of[album_id] = doc
+            self._doc_tokens[doc] = tokens
+            self._stamps[album_id] = stamp
+
+            bit = 1 << doc
+            postings, short = self._postings, self._short
+            for tok in tokens:
+                old = postings.get(tok)
+                if old is None:
+                    postings[tok] = bit
+                    for tg in _trigrams(tok):
+                        self._trigrams.setdefault(tg, set()).add(tok)
+                    self._vocab_dirty = True
+                else:
+                    postings[tok] = old | bit
+                for n in range(1, min(len(tok), self.SHORT_PREFIX) + 1):
+                    p = tok[:n]
+                    short[p] = short.get(p, 0) | bit
+
+    def remove(self, album_id: str) -> None:
+        with self._lock:
+            self._remove(album_id)
+
+    def _remove(self, album_id: str) -> None:
+        doc = self._doc_of.pop(album_id, None)
+        if doc is None:
+            return
+        self._stamps.pop(album_id, None)
+        mask = ~(1 << doc)
+        for tok in self._doc_tokens.pop(doc):
+            bits = self._postings[tok] & mask
+            if bits:
+                self._postings[tok] = bits
+            else:
+                del self._postings[tok]
+                for tg in _trigrams(tok):
+                    self._trigrams[tg].discard(tok)
+                self._vocab_dirty = True
+            for n in range(1, min(len(tok), self.SHORT_PREFIX) + 1):
+                p = tok[:n]
+                bits = self._short.get(p, 0) & mask
+                if bits:
+                    self._short[p] = bits
+                else:
+                    self._short.pop(p, None)
+        self._ids[doc] = None
+        self._ids_dirty = True
+        self._free.append(doc)
+
+    def search(self, query: str, limit: int | None = None) -> list[str]:
+        """ album_ids matching every word of `query` (each as a prefix), in index order. """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            if self._vocab_dirty:
+                self._vocab = sorted(self._postings)
+                self._vocab_dirty = False
+            if self._ids_dirty:
+                self._id_array = np.array(self._ids, dtype=object)
+                self._ids_dirty = False
+
+            bits = -1
+            for term in sorted(set(terms), key=len, reverse=True):  # most selective first
+                bits &= self._term_bits(term)
+                if not bits:
+                    return []
+            docs = _bit_positions(bits)
+            if limit is not None:
+                docs = docs[:limit]
+            return self._id_array[docs].tolist()
+
+    def _term_bits(self, term: str) -> int:
+        if len(term) <= self.SHORT_PREFIX:
+            return self._short.get(term, 0)
+
+        vocab, postings = self._vocab, self._postings
+        bits = 0
+        i = bisect_left(vocab, term)
+        while i < len(vocab) and vocab[i].startswith(term):
+            bits |= postings[vocab[i]]
+            i += 1
+        return bits or self._fuzzy_bits(term)
+
+    def _fuzzy_bits(self, term: str) -> int:
+        grams = _trigrams(term)
+        counts: Counter[str] = Counter()
+        for tg in grams:
+            counts.update(self._trigrams.get(tg, ()))
+        bits = 0
+        for tok, shared in counts.items():
+            # Dice coefficient over trigram sets (a padded word of n chars has n + 1)
+            if 2 * shared / (len(grams) + len(tok) + 1) >= self.FUZZY_MIN_SIMILARITY:
+                bits |= self._postings[tok]
+        return bits
+
+    def build(self, albums: Iterable[tuple[str, dict, object]]) -> None:
+        """ Add many (album_id, album.json dict, stamp) at once. """
+        for album_id, data, stamp in albums:
+            self.add(album_id, data, stamp)
+
+def _bit_positions(bits: int) -> np.ndarray:
+    """ Indices of the set bits of a non-negative int, via numpy rather than a Python loop. """
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    return np.flatnonzero(np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder="little"))
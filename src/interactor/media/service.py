@@ -1,92 +1,208 @@
-import warnings
 from pathlib import Path
-import json
+import hashlib
+import random
+import threading
+from typing import Callable, Iterable
 from src.interactor.core.config import Settings
-from .models import Album, Track
+from . import fastjson
+from .cache import CacheStats, LRUCache
+from .index import LibraryIndex, RefreshStats
+from .models import Album, AlbumSummary, Track
+from .search import SearchIndex
 
-class MediaService:
-    def __init__(self, settings: Settings):
-        self.assets_root = Path(settings.assets_dir)
-        self._id_to_dir: dict[str, Path] = {}
-        self._cache: dict[str, Album] = {}
-
-        self.refresh_index()
+def _album_nbytes(album: Album) -> int:
+    """ Rough in-memory footprint of an Album, for the cache byte budget (doesn't force track validation). """
+    return 1024 + 1536 * len(album.raw_tracks)
 
-    def refresh_index(self) -> None:
-        self._id_to_dir.clear()
-        self._cache.clear()
-        root = self.assets_root
-        if not root.exists():
-            return
+class MediaService:
+    _shared: dict[Path, "MediaService"] = {}
+    _shared_lock = threading.Lock()
 
-        for album_dir in root.iterdir():
-            if album_dir.name == "ARTIST - ALBUM (YEAR)":
+    def __init__(self, settings: Settings, index_path: str | Path | None = None, refresh: bool = True):
+        self.assets_root = Path(settings.assets_dir)
+        self._cache: LRUCache[str, Album] = LRUCache(max_entries=settings.album_cache_entries,
+                                                     max_bytes=settings.album_cache_bytes,
+                                                     sizeof=_album_nbytes)
+
+        # Persistent album index (one per library root), so startup only re-parses
+        # album.json files that changed
+        if index_path is None:
+            root_key = hashlib.sha1(str(self.assets_root.resolve()).encode("utf-8")).hexdigest()[:12]
+            index_path = Path(settings.cache_dir) / f"library-{root_key}.sqlite"
+        self._index = LibraryIndex(index_path)
+        self.last_refresh: RefreshStats | None = None
+        # Filled by refresh_search(), which is slow on a cold start, so run it off the UI thread
+        self.search = SearchIndex()
+
+        # Otherwise serve whatever the last run saw; call refresh_index() (e.g. from a worker) to catch up
+        if refresh:
+            self.refresh_index()
+
+    @classmethod
+    def shared(cls, settings: Settings, refresh: bool = True) -> "MediaService":
+        """
+        The process-wide service for this library root. Widgets should use this rather than
+        constructing their own, so each album is parsed, validated and cached once.
+        `refresh` only matters for the first call, which creates the service.
+        """
+        key = Path(settings.assets_dir)
+        with cls._shared_lock:
+            service = cls._shared.get(key)
+            if service is None:
+                service = cls(settings, refresh=refresh)
+                cls._shared[key] = service
+            return service
+
+    def refresh_index(self, on_album: Callable[[AlbumSummary], None] | None = None) -> RefreshStats:
+        """
+        Rescan the library. Safe to run off the UI thread: the index is written in batches, so
+        albums become visible to get_album() as the scan goes, and `on_album(summary)` is
+        called for each as it is found.
+        """
+        def found(summary: AlbumSummary, changed: bool) -> None:
+            if changed:
+                self._cache.pop(summary.album_id)
+            on_album(summary)
+
+        self.last_refresh = self._index.refresh(self.assets_root, found if on_album else None)
+        if not on_album and (self.last_refresh.parsed or self.last_refresh.removed):
+            self._cache.clear()
+        # Deleted albums never come through `found`, drop them so get_album() stops serving them
+        for album_id in self.last_refresh.removed_ids:
+            self._cache.pop(album_id)
+        return self.last_refresh
+
+    def refresh_search(self) -> int:
+        """
+        Bring the search index in line with the library index: re-index albums whose album.json
+        changed since they were indexed and drop removed ones. Returns how many were (re)indexed.
+        """
+        stamps = self._index.stamps()
+        for album_id in self.search.album_ids() - stamps.keys():
+            self.search.remove(album_id)
+
+        stale = {album_id: stamp for album_id, stamp in stamps.items()
+                 if self.search.stamp(album_id) != stamp[1:]}
+        raws = self._index.raws(album_dir for album_dir, _, _ in stale.values())
+
+        changed = 0
+        for album_id, (album_dir, mtime_ns, size) in stale.items():
+            raw = raws.get(album_dir)
+            try:
+                data = fastjson.loads(raw) if raw else {}
+            except fastjson.DecodeError:
                 continue
-
-            j = album_dir / "album.json"
-            if not j.exists():
+            if not isinstance(data, dict):
                 continue
+            self.search.add(album_id, data, stamp=(mtime_ns, size))
+            changed += 1
+        return changed
 
-            try:
-                data = json.loads(j.read_text(encoding="utf-8"))
-                album_id = data.get("album_id")
-                if album_id:
-                    self._id_to_dir[album_id] = album_dir
-                else:
-                    warnings.warn(f"No album id found in {j}")
-            except Exception as e:
-                warnings.warn(f"Had to skip {j}: {e!r}")
-                continue
+    def search_albums(self, query: str) -> list[str]:
+        """ album_ids whose album or track metadata matches `query` (type-ahead, every word a prefix). """
+        return self.search.search(query)
 
     def list_albums(self) -> list[Path]:
         """ Loads all albums """
-        return [self._id_to_dir[k] for k in sorted(self._id_to_dir.keys())]
+        return [s.album_dir for s in self.list_summaries()]
+
+    def list_summaries(self) -> list[AlbumSummary]:
+        """ Per-album rows for the library grid, sorted by album_id. Never touches album.json. """
+        return self._index.summaries()
+
+    def summaries_page(self, after: AlbumSummary | None, limit: int) -> list[AlbumSummary]:
+        """ The next `limit` summaries after `after` (None = from the start), in list_summaries() order. """
+        return self._index.summaries_after(after, limit)
+
+    def summaries_for(self, album_ids: Iterable[str]) -> list[AlbumSummary]:
+        """ Summaries of just these albums (e.g. search hits), in list_summaries() order. """
+        return self._index.summaries_for(album_ids)
+
+    def album_count(self) -> int:
+        return self._index.count()
+
+    def random_album_id(self) -> str | None:
+        n = self._index.count()
+        return self._index.album_id_at(random.randrange(n)) if n else None
+
+    def get_summary(self, album: str | Path) -> AlbumSummary | None:
+        """ Summary by album_id, or by album directory. """
+        if isinstance(album, str):
+            return self._index.summary(album_id=album)
+        return self._index.summary(album_dir=album)
 
     def load_album(self, album_dir: Path) -> Album:
         album_dir = Path(album_dir)
-        data = json.loads((album_dir / 'album.json').read_text(encoding='utf-8'))
-
-        cover = album_dir / 'cover.jpg'
-        if cover.exists():
+        # Reuse the bytes the index read, only albums it hasn't seen go back to disk
+        raw = self._index.raw(album_dir)
+        if raw is None:
+            raw = (album_dir / 'album.json').read_bytes()
+        data = fastjson.loads(raw)
+
+        cover = self.cover_path(album_dir)
+        if cover:
             data.setdefault('album_cover', str(cover))
 
+        # metadata_gen stores alt art by file name, the files live in the album's alt_art folder
+        art_dir = album_dir / 'alt_art'
         alt_art = data.get('alt_art')
         if isinstance(alt_art, dict):
-            if 'animated_cover' in alt_art:
-                ac = alt_art['animated_cover']
-                alt_art['animated_cover'] = str((album_dir / ac).resolve())
+            for key, value in alt_art.items():
+                if isinstance(value, str):  # animated_cover
+                    alt_art[key] = str((art_dir / value).resolve())
+                elif isinstance(value, list):  # per-track art, keyed by the track's file stem
+                    alt_art[key] = [str((art_dir / f).resolve()) for f in value]
 
         for track in data.get('tracks', []):
             if track.get('lyrics'):
                 track['lyrics'] = str((album_dir / track['lyrics']).resolve())
             if 'alt_art_track' in track and isinstance(track['alt_art_track'], list):
-                track['alt_art_track'] = [str((album_dir / f).resolve()) for f in track['alt_art_track']]
+                # Track.alt_art is the field the app reads
+                track['alt_art'] = [str((art_dir / f).resolve()) for f in track.pop('alt_art_track')]
 
+        # Tracks stay raw until Album.tracks is first read
         return Album.model_validate(data)
 
     def get_album(self, album_id: str) -> Album | None:
-        if album_id in self._cache:
-            return self._cache[album_id]
+        album = self._cache.get(album_id)
+        if album is not None:
+            return album
 
-        album_dir = self._id_to_dir.get(album_id)
-        if not album_dir:
+        summary = self._index.summary(album_id=album_id)
+        if not summary:
             return None
 
-        album = self.load_album(album_dir)
-        self._cache[album_id] = album
+        album = self.load_album(summary.album_dir)
+        self._cache.put(album_id, album)
         return album
 
+    def cache_stats(self) -> CacheStats:
+        """ Hit / miss / eviction counters of the album cache. """
+        return self._cache.stats()
+
     def get_album_tracks(self, album_id: str) -> list[Track]:
         album = self.get_album(album_id)
         return album.sorted_tracks() if album else []
 
     def cover_path(self, album: str | Path) -> Path | None:
-        album_dir = self._id_to_dir.get(album) if isinstance(album, str) else album
-        if not album_dir:
+        summary = self.get_summary(album)
+        if summary:
+            return summary.cover
+        if isinstance(album, str):
             return None
-        album_dir = Path(album_dir)
-        path = album_dir / 'cover.jpg'
+        path = Path(album) / 'cover.jpg'
+        return path if path.exists() else None
+
+    @staticmethod
+    def audio_path(track: Track) -> Path | None:
+        """
+        The track's FLAC. metadata_gen names the lyrics file after the audio file,
+        so it sits beside the (already resolved) lyrics path with a .flac suffix.
+        """
+        if not track.lyrics:
+            return None
+        path = Path(track.lyrics).with_suffix('.flac')
         return path if path.exists() else None
 
     def get_id_to_dir_keys(self):
-        return self._id_to_dir.keys()
\ No newline at end of file
+        return [s.album_id for s in self.list_summaries()]
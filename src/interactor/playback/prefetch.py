@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import unquote, urlparse
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from ..audio.vizcache import cached_viz, viz_cache_path
+from ..lyrics.lrc import cached_lrc
+from ..media.models import Album, Track
+from ..media.service import MediaService
+from .base import TrackRef
+from .service import PlaybackService
+
+if TYPE_CHECKING:
+    from ..ui.thumbnails import ThumbnailService
+
+class QueuePrefetcher(QObject):
+    """
+    Warms the shared caches for the next `depth` tracks of the play queue whenever the track
+    changes, so the switch itself is served from memory:
+
+    - album.json, parsed and its tracks validated (MediaService album cache)
+    - the track's lyrics, parsed (lyrics.lrc cache)
+    - cover and alt-art thumbnails at `cover_heights`, by default the sizes the library grid
+      and hero ask for (ThumbnailService disk cache)
+    - the album's animated cover, read ahead into the OS page cache (there is no decoded form)
+    - the precomputed visualization frames, mapped and paged in (audio.vizcache)
+
+    The work runs on a single background thread, in queue order. A newer track change
+    supersedes whatever is still pending from the previous one.
+    """
+    prefetched = Signal(object) # TrackRef whose assets are now cached
+
+    def __init__(self, playback: PlaybackService, media: MediaService,
+                 thumbnails: ThumbnailService | None = None, depth: int = 2,
+                 cover_heights: tuple[int, ...] | None = None, parent=None):
+        super().__init__(parent)
+        self.playback = playback
+        self.media = media
+        self.thumbnails = thumbnails
+        self.depth = depth
+        if cover_heights is None:
+            cover_heights = _ui_cover_heights() if thumbnails is not None else ()
+        self.cover_heights = tuple(cover_heights)
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        self.tracks_prefetched = 0
+
+        playback.trackChanged.connect(self._on_track_changed)
+
+    def _on_track_changed(self, _ref: TrackRef) -> None:
+        self.schedule(self.playback.upcoming(self.depth))
+
+    def schedule(self, refs: list[TrackRef]) -> None:
+        """ Prefetch `refs` in order on the worker, dropping anything queued before. """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        if refs:
+            self._pool.start(_PrefetchJob(self, generation, list(refs)))
+
+    def is_current(self, generation: int) -> bool:
+        with self._lock:
+            return generation == self._generation
+
+    def wait(self, msecs: int = -1) -> bool:
+        """ Block until queued prefetches are done (shutdown, scripts). """
+        return self._pool.waitForDone(msecs)
+
+    def prefetch(self, ref: TrackRef) -> None:
+        """ Load one track's assets into the caches. Runs on the worker thread. """
+        album = self.media.get_album(ref.album_id)
+        if album is None:
+            return
+        summary = self.media.get_summary(ref.album_id)
+        track = _find_track(album, ref)
+
+        if track is not None and track.lyrics:
+            cached_lrc(track.lyrics)
+
+        if self.thumbnails is not None and self.cover_heights:
+            images = [summary.cover] if summary and summary.cover else []
+            if track is not None:
+                images += [Path(p) for p in track.alt_art if _is_image(p)]
+            for path in images:
+                for height in self.cover_heights:
+                    self.thumbnails.request(path, height)
+
+        animated = (album.alt_art or {}).get("animated_cover")
+        if isinstance(animated, str):
+            _read_ahead(animated)
+
+        if track is not None and summary:
+            viz = cached_viz(viz_cache_path(summary.album_dir, track.disc, track.track))
+            if viz is not None:
+                viz.warm()
+
+        self.tracks_prefetched += 1
+        self.prefetched.emit(ref)
+
+_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}
+
+def _is_image(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in _IMAGE_SUFFIXES
+
+def _ui_cover_heights() -> tuple[int, ...]:
+    """ Thumbnail heights the library grid and the hero request, so prefetched ones are hits. """
+    from ..ui.models.album_list_model import THUMB_HEIGHT
+    from ..ui.widgets.hero_widget import COVER_HEIGHT
+    return THUMB_HEIGHT, COVER_HEIGHT
+
+def _read_ahead(path: str | Path) -> None:
+    """ Get a file into the OS page cache without keeping it in memory ourselves. """
+    try:
+        with open(path, "rb") as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            else:
+                while f.read(1 << 20):
+                    pass
+    except OSError:
+        pass
+
+def _uri_path(uri: str) -> Path:
+    if "://" in uri:
+        return Path(unquote(urlparse(uri).path))
+    return Path(uri)
+
+def _find_track(album: Album, ref: TrackRef) -> Track | None:
+    """ The album track a queue entry plays: by audio file (beside its lyrics), else by title. """
+    audio = _uri_path(ref.uri)
+    for t in album.tracks:
+        if t.lyrics and Path(t.lyrics).with_suffix('.flac') == audio:
+            return t
+    for t in album.tracks:
+        if t.track_title == ref.title:
+            return t
+    return None
+
+class _PrefetchJob(QRunnable):
+    def __init__(self, prefetcher: QueuePrefetcher, generation: int, refs: list[TrackRef]):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.generation = generation
+        self.refs = refs
+
+    def run(self):
+        for ref in self.refs:
+            # Stop early once the queue has moved on, the next job covers the new neighbours
+            if not self.prefetcher.is_current(self.generation):
+                return
+            try:
+                self.prefetcher.prefetch(ref)
+            except Exception:
+                # A broken album or lyrics file only costs that track its head start
+                continue
@@ -18,6 +18,7 @@ class PlaybackService(QObject):
         super().__init__(parent)
         self._player: Player | None = None
         self._queue: list[TrackRef] = []
+        self._index: int | None = None
         self._state = PlaybackState.STOPPED
         self._poll = QTimer(self)
         self._poll.setInterval(100)
@@ -33,10 +34,24 @@ class PlaybackService(QObject):
         assert self._player is not None, "Playback backend not set"
         self._queue = items
         self._player.set_queue(items, start_index)
-        idx = self._player.current_index()
+        self._index = idx = self._player.current_index()
         if idx is not None and 0 <= idx < len(items):
             self.trackChanged.emit(items[idx])
 
+    @property
+    def queue(self) -> list[TrackRef]:
+        return self._queue
+
+    def current_index(self) -> int | None:
+        return self._player.current_index() if self._player else None
+
+    def upcoming(self, n: int) -> list[TrackRef]:
+        """ Up to `n` queued tracks after the current one. """
+        idx = self.current_index()
+        if idx is None:
+            return []
+        return self._queue[idx + 1:idx + 1 + n]
+
     def play(self):
         assert self._player is not None
         self._player.play()
@@ -72,6 +87,12 @@ class PlaybackService(QObject):
         if pos is not None:
             self.positionChanged.emit(pos)
 
+        # The backend moved on to another track by itself
+        idx = self._player.current_index()
+        if idx != self._index and idx is not None and 0 <= idx < len(self._queue):
+            self._index = idx
+            self.trackChanged.emit(self._queue[idx])
+
     def play_tracks(self, items: list[TrackRef], start_index: int = 0):
         self.load_queue(items, start_index)
         self.play()
@@ -0,0 +1,61 @@
+# src/interactor/scripts/build_viz_cache.py
+"""
+Precompute visualizer band frames for every track in the library and store them beside
+each album.json, so local playback can read them through a memory map instead of running
+FFTs live. Tracks whose cache is already up to date with their FLAC are skipped.
+
+    python -m src.interactor.scripts.build_viz_cache --hop 512 --bands 48 --quant uint8
+"""
+import argparse, time
+
+from ..core.config import Settings
+from ..audio.offline import OfflineAnalyzer
+from ..audio.vizcache import Quant, VizCache, viz_cache_path, write_viz_cache
+from ..media.service import MediaService
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n-fft", type=int, default=1024)
+    ap.add_argument("--hop", type=int, default=512)
+    ap.add_argument("--bands", type=int, default=48)
+    ap.add_argument("--quant", choices=[q.name.lower() for q in Quant], default="uint8")
+    ap.add_argument("--force", action="store_true", help="rebuild even if the cache is fresh")
+    args = ap.parse_args()
+
+    s = Settings.from_file()
+    media = MediaService(s)
+    analyzer = OfflineAnalyzer(s, n_fft=args.n_fft, hop=args.hop, n_bands=args.bands)
+    quant = Quant[args.quant.upper()]
+
+    built = skipped = missing = failed = 0
+    t0 = time.perf_counter()
+    for album_dir in media.list_albums():
+        album = media.load_album(album_dir)
+        for track in album.sorted_tracks():
+            audio = media.audio_path(track)
+            if audio is None:
+                missing += 1
+                continue
+
+            dest = viz_cache_path(album_dir, track.disc, track.track)
+            cache = VizCache.open(dest)
+            if (not args.force and cache is not None and cache.is_fresh(audio)
+                    and (cache.hop, cache.n_fft, cache.n_bands) == (args.hop, args.n_fft, args.bands)):
+                skipped += 1
+                continue
+            del cache  # release the map before replacing the file
+
+            try:
+                bands, sr = analyzer.analyze_file(audio)
+                write_viz_cache(dest, bands, sr, args.hop, args.n_fft, quant=quant, source=audio)
+                built += 1
+                print(f"{dest.relative_to(s.assets_dir)}: {bands.shape[0]} frames")
+            except Exception as e:
+                failed += 1
+                print(f"Failed {audio.name}: {e!r}")
+
+    dt = time.perf_counter() - t0
+    print(f"\nbuilt={built} up-to-date={skipped} no-audio={missing} failed={failed} in {dt:.1f}s")
+
+if __name__ == "__main__":
+    main()
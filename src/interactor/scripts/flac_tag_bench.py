@@ -0,0 +1,67 @@
+# src/interactor/scripts/flac_tag_bench.py
+"""
+Header-only FLAC tag reading (media.flac_header) vs mutagen on files with large embedded art.
+Writes N minimal FLACs carrying a cover PICTURE block of --art-mb each, then times reading
+title / artist / track number / length from all of them both ways and checks they agree.
+
+    python -m src.interactor.scripts.flac_tag_bench --files 200 --art-mb 4
+"""
+import argparse, tempfile, time
+from pathlib import Path
+
+from mutagen.flac import FLAC, Picture
+
+from ..media.flac_header import read_flac_tags
+
+def make_flac(path: Path, title: str, art_bytes: int, seconds: int = 180) -> None:
+    """ A STREAMINFO-only FLAC (no audio frames, which tag readers never touch) tagged through mutagen. """
+    sr, channels, bits = 44100, 2, 16
+    packed = (sr << 44) | ((channels - 1) << 41) | ((bits - 1) << 36) | (sr * seconds)
+    streaminfo = (4096).to_bytes(2, "big") * 2 + bytes(6) + packed.to_bytes(8, "big") + bytes(16)
+    path.write_bytes(b"fLaC" + bytes([0x80]) + len(streaminfo).to_bytes(3, "big") + streaminfo)
+
+    audio = FLAC(path)
+    audio["TITLE"] = title
+    audio["ARTIST"] = "Artist; Featured"
+    audio["TRACKNUMBER"] = "1/12"
+    if art_bytes:
+        pic = Picture()
+        pic.type, pic.mime, pic.data = 3, "image/jpeg", bytes(art_bytes)
+        audio.add_picture(pic)
+    audio.save()
+
+def read_fields(audio) -> tuple:
+    return audio["TITLE"][0], audio["ARTIST"][0], audio["TRACKNUMBER"][0], round(audio.info.length, 3)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=200)
+    ap.add_argument("--art-mb", type=float, default=4.0)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(args.files):
+            path = Path(tmp) / f"{i:04d}.flac"
+            make_flac(path, f"Track {i}", int(args.art_mb * 1024 * 1024))
+            files.append(path)
+        size_mb = sum(f.stat().st_size for f in files) / 1e6
+        print(f"{args.files} files, {args.art_mb} MB of art each ({size_mb:.0f} MB total, page cache warm)")
+
+        results = {}
+        for name, reader in (("mutagen", FLAC), ("header", read_flac_tags)):
+            best = float("inf")
+            for _ in range(3):
+                t0 = time.perf_counter()
+                fields = [read_fields(reader(f)) for f in files]
+                best = min(best, time.perf_counter() - t0)
+            results[name] = (best, fields)
+
+        base, reference = results["mutagen"]
+        for name, (best, fields) in results.items():
+            check = "equal" if fields == reference else "MISMATCH"
+            print(f"{name:>8}: {best * 1000:8.1f} ms  {best / args.files * 1e6:8.1f} us/file  "
+                  f"({base / best:5.1f}x, {check})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# src/interactor/scripts/index_timing.py
+"""
+Cold vs warm MediaService startup against a synthetic library, to check the persistent
+index pays off. Builds N fake albums in a temp dir, then times:
+    cold    - empty index, every album.json parsed
+    warm    - nothing changed, stat only
+    partial - 1% of albums touched
+    broken  - a few album.json files that are not albums, must be skipped and counted as failed
+
+    python -m src.interactor.scripts.index_timing --albums 3000
+"""
+import argparse, json, tempfile, time, warnings
+from pathlib import Path
+
+from ..core.config import Settings
+from ..media.service import MediaService
+
+def fake_album(i: int, n_tracks: int = 12) -> dict:
+    """ album.json contents for synthetic album `i`. """
+    tracks = [{
+        "track_title": f"Track {t}", "track_artist": [f"Artist {i % 97}"],
+        "composer": [], "lyricist": [], "disc": 1, "track": t + 1,
+        "duration": 200.0, "release_date": "2020-01-01", "lyrics": f"{t + 1:02d}.lrc",
+    } for t in range(n_tracks)]
+    return {
+        "album_id": f"{i:026d}", "album_title": f"Album {i}", "album_artist": f"Artist {i % 97}",
+        "release_year": "2020", "disc_total": 1, "track_total": n_tracks, "tracks": tracks,
+    }
+
+def make_library(root: Path, n_albums: int, n_tracks: int = 12) -> list[Path]:
+    dirs = []
+    for i in range(n_albums):
+        d = root / f"Artist {i % 97} - Album {i} (2020)"
+        d.mkdir(parents=True)
+        (d / "album.json").write_text(json.dumps(fake_album(i, n_tracks)), encoding="utf-8")
+        dirs.append(d)
+    return dirs
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--albums", type=int, default=3000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        dirs = make_library(tmp / "library", args.albums)
+        s = Settings(assets_dir=tmp / "library", cache_dir=tmp / "cache")
+
+        t0 = time.perf_counter()
+        media = MediaService(s)
+        print(f"cold:    {(time.perf_counter() - t0) * 1000:8.1f} ms  ({media.last_refresh})")
+
+        t0 = time.perf_counter()
+        media = MediaService(s)
+        print(f"warm:    {(time.perf_counter() - t0) * 1000:8.1f} ms  ({media.last_refresh})")
+
+        for d in dirs[::100]:
+            (d / "album.json").touch()
+        time.sleep(0.01)
+        t0 = time.perf_counter()
+        media.refresh_index()
+        print(f"partial: {(time.perf_counter() - t0) * 1000:8.1f} ms  ({media.last_refresh})")
+
+        broken = {dirs[0]: "[1, 2]", dirs[1]: '"album"', dirs[2]: "{not json"}
+        for d, text in broken.items():
+            (d / "album.json").write_text(text, encoding="utf-8")
+        t0 = time.perf_counter()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            stats = media.refresh_index()
+        print(f"broken:  {(time.perf_counter() - t0) * 1000:8.1f} ms  ({stats})")
+        assert stats.failed == len(broken), stats
+        assert len(caught) == len(broken), [str(w.message) for w in caught]
+        assert media.album_count() == args.albums - len(broken)
+
+if __name__ == "__main__":
+    main()
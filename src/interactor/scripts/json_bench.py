@@ -0,0 +1,60 @@
+# src/interactor/scripts/json_bench.py
+"""
+Album decode throughput per media.fastjson backend over a synthetic in-memory library:
+bytes -> dict -> Album -> validated tracks, i.e. what opening every album costs.
+The pydantic row is the reference path; the others are checked to produce equal Albums.
+
+    python -m src.interactor.scripts.json_bench --albums 10000
+"""
+import argparse, gc, json, time
+
+from ..media import fastjson
+from ..media.models import Album, Track
+from .index_timing import fake_album
+
+def decode_all(blobs: list[bytes]) -> list[Album]:
+    albums = []
+    for raw in blobs:
+        album = Album.model_validate(fastjson.loads(raw))
+        album.tracks
+        albums.append(album)
+    return albums
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--albums", type=int, default=10000)
+    ap.add_argument("--tracks", type=int, default=12)
+    args = ap.parse_args()
+
+    blobs = [json.dumps(fake_album(i, args.tracks)).encode("utf-8") for i in range(args.albums)]
+    print(f"{args.albums} albums x {args.tracks} tracks, {sum(map(len, blobs)) / 1e6:.1f} MB of JSON")
+
+    reference = None
+    for name in ("pydantic", "orjson", "msgspec"):
+        if fastjson.set_backend(name) != name:
+            print(f"{name:>9}: not installed")
+            continue
+        best = float("inf")
+        for _ in range(3):
+            albums = None
+            gc.collect()
+            gc.disable()  # like timeit, keep collector pauses out of the numbers
+            t0 = time.perf_counter()
+            albums = decode_all(blobs)
+            best = min(best, time.perf_counter() - t0)
+            gc.enable()
+
+        if reference is None:
+            reference, base = albums, best
+            check = "reference"
+        else:
+            same = all(a.model_dump() == b.model_dump() and a.tracks == b.tracks
+                       and all(isinstance(t, Track) for t in a.tracks)
+                       for a, b in zip(albums, reference))
+            check = f"{base / best:4.1f}x, {'equal' if same else 'MISMATCH'}"
+        print(f"{name:>9}: {best * 1000:8.1f} ms  {args.albums / best:9.0f} albums/s  ({check})")
+
+    fastjson.set_backend("auto")
+
+if __name__ == "__main__":
+    main()
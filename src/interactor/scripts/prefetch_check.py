@@ -0,0 +1,114 @@
+# src/interactor/scripts/prefetch_check.py
+"""
+End-to-end check of playback.prefetch.QueuePrefetcher against a synthetic album (cover,
+per-track alt art, animated cover, lyrics and viz caches) and a stand-in player: after a
+queue is loaded and the player advances, every asset of the next tracks must be cached,
+including thumbnail files on disk at the heights the grid and hero request.
+
+    QT_QPA_PLATFORM=offscreen python -m src.interactor.scripts.prefetch_check --depth 2
+"""
+import argparse, json, tempfile
+from pathlib import Path
+
+import numpy as np
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from ..audio.vizcache import viz_cache_path, write_viz_cache
+from ..core.config import Settings
+from ..lyrics.lrc import cache_stats
+from ..media.service import MediaService
+from ..playback.base import Player, PlayerCapabilities, TrackRef
+from ..playback.prefetch import QueuePrefetcher, _ui_cover_heights
+from ..playback.service import PlaybackService
+from ..ui.thumbnails import ThumbnailService
+from .index_timing import fake_album
+
+class QueuePlayer(Player):
+    """ Plays nothing, just remembers its place in the queue. """
+    def __init__(self):
+        self.index = None
+    def name(self): return "check"
+    def capabilities(self): return PlayerCapabilities(can_seek=False, can_pause=False, has_audio_output=False)
+    def set_queue(self, items, start_index=0): self.index = start_index
+    def play(self): pass
+    def pause(self): pass
+    def stop(self): pass
+    def seek(self, position_s): pass
+    def current_position_s(self): return 0.0
+    def current_index(self): return self.index
+    def set_volume(self, volume): pass
+
+def image(path: Path, shade: int) -> None:
+    img = QImage(640, 640, QImage.Format_RGB32)
+    img.fill(QColor(shade, 80, 255 - shade))
+    img.save(str(path))
+
+def make_album(album_dir: Path, n_tracks: int) -> dict:
+    data = fake_album(0, n_tracks)
+    art_dir = album_dir / "alt_art"
+    art_dir.mkdir(parents=True)
+    image(album_dir / "cover.jpg", 0)
+    (art_dir / "album.mp4").write_bytes(bytes(1 << 16))
+    data["alt_art"] = {"animated_cover": "album.mp4"}
+    for i, t in enumerate(data["tracks"]):
+        stem = Path(t["lyrics"]).stem
+        image(art_dir / f"{stem}.jpg", 20 * i % 255)
+        t["alt_art_track"] = [f"{stem}.jpg"]
+        data["alt_art"][stem] = [f"{stem}.jpg"]
+        (album_dir / t["lyrics"]).write_text(f"[00:01.00]line one of {i}\n[00:04.00]line two\n", encoding="utf-8")
+        write_viz_cache(viz_cache_path(album_dir, t["disc"], t["track"]), np.random.rand(500, 32), 48000, 512, 1024)
+    (album_dir / "album.json").write_text(json.dumps(data), encoding="utf-8")
+    return data
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tracks", type=int, default=8)
+    ap.add_argument("--depth", type=int, default=2)
+    args = ap.parse_args()
+
+    app = QApplication([])
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        album_dir = tmp / "library" / "Artist - Album (2020)"
+        data = make_album(album_dir, args.tracks)
+        s = Settings(assets_dir=tmp / "library", cache_dir=tmp / "cache")
+
+        media = MediaService(s)
+        thumbs = ThumbnailService.shared(s)
+        playback = PlaybackService()
+        player = QueuePlayer()
+        playback.set_backend(player)
+        prefetcher = QueuePrefetcher(playback, media, thumbs, depth=args.depth)
+        assert prefetcher.cover_heights == _ui_cover_heights(), prefetcher.cover_heights
+
+        refs = [TrackRef(f"t{i}", data["album_id"], str(album_dir / Path(t["lyrics"]).with_suffix(".flac")),
+                         t["track_title"], []) for i, t in enumerate(data["tracks"])]
+        playback.load_queue(refs, 0)
+        prefetcher.wait()
+        player.index = 2
+        playback._tick()  # the player advanced by itself
+        prefetcher.wait()
+        thumbs.wait()
+        app.processEvents()
+
+        album = media.get_album(data["album_id"])
+        expected = sorted({i for start in (1, 3) for i in range(start, start + args.depth) if i < args.tracks})
+        missing = []
+        for i in expected:
+            track = album.sorted_tracks()[i]
+            for path in [album_dir / "cover.jpg", *track.alt_art]:
+                for h in prefetcher.cover_heights:
+                    if not thumbs.cache_path(str(path), h).exists():
+                        missing.append(f"thumbnail {Path(path).name}@{h}")
+        print(f"prefetched {prefetcher.tracks_prefetched} tracks, thumbnails decoded {thumbs.decoded}, "
+              f"lyrics {cache_stats()}, album cache {media.cache_stats()}")
+        assert album.alt_art["animated_cover"] == str((album_dir / "alt_art" / "album.mp4").resolve())
+        assert not missing, missing
+        scheduled = sum(min(args.depth, args.tracks - start) for start in (1, 3))
+        assert prefetcher.tracks_prefetched == scheduled, prefetcher.tracks_prefetched
+        assert cache_stats().entries >= len(expected)
+        print("ok")
+
+if __name__ == "__main__":
+    main()
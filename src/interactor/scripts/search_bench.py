@@ -0,0 +1,64 @@
+# src/interactor/scripts/search_bench.py
+"""
+Build time and type-ahead latency of media.search.SearchIndex over a synthetic library
+(default 100k tracks). Titles and names come from a fixed word list so prefixes are shared
+the way real metadata shares them.
+
+    python -m src.interactor.scripts.search_bench --albums 8400 --tracks 12
+"""
+import argparse, random, time
+
+from ..media.search import SearchIndex
+
+WORDS = ("love night blue heart fire dream city light rain gold river summer shadow ghost wild "
+         "electric moon stone silver ocean velvet midnight paradise echo neon thunder honey "
+         "crystal desert highway broken sugar storm garden frozen golden tender lonely").split()
+NAMES = ("Alice Bruno Carmen Dmitri Elena Farah Gustav Hana Ivan Jun Kofi Lena Mateo Nadia Omar "
+         "Priya Quinn Rosa Sven Tomas Uma Viktor Wen Ximena Yusuf Zoe Beyonce Bjork Sinead").split()
+
+def fake_album(rng: random.Random, i: int, n_tracks: int) -> dict:
+    def title(k):
+        return " ".join(rng.choice(WORDS) for _ in range(k)) + f" {rng.randrange(1000)}"
+    def person():
+        return f"{rng.choice(NAMES)} {rng.choice(NAMES)}son{rng.randrange(200)}"
+    artist = person()
+    return {
+        "album_id": f"{i:026d}", "album_title": title(2), "album_artist": artist,
+        "tracks": [{"track_title": title(3), "track_artist": [artist, person()],
+                    "composer": [person()], "lyricist": [person()]} for _ in range(n_tracks)],
+    }
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--albums", type=int, default=8400)
+    ap.add_argument("--tracks", type=int, default=12)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    albums = [fake_album(rng, i, args.tracks) for i in range(args.albums)]
+
+    index = SearchIndex()
+    t0 = time.perf_counter()
+    index.build((a["album_id"], a, None) for a in albums)
+    print(f"built {args.albums} albums / {args.albums * args.tracks} tracks in {time.perf_counter() - t0:.2f} s, "
+          f"{len(index._postings)} words")
+
+    queries = ["l", "lo", "lov", "love", "love ni", "midnight gold", "alice", "alicebj", "bjork velvet",
+               "ghots", "sinead rosa", "thunder 42", "nothing matches this"]
+    for q in queries:
+        index.search(q)  # sorted vocabulary is built on the first query
+        best = float("inf")
+        for _ in range(5):
+            t0 = time.perf_counter()
+            for _ in range(20):
+                hits = index.search(q)
+            best = min(best, (time.perf_counter() - t0) / 20)
+        print(f"{q!r:>24}: {best * 1e6:8.1f} us  {len(hits):6d} albums")
+
+    t0 = time.perf_counter()
+    for a in albums[:100]:
+        index.add(a["album_id"], a)
+    print(f"re-index one album: {(time.perf_counter() - t0) / 100 * 1e6:.0f} us")
+
+if __name__ == "__main__":
+    main()
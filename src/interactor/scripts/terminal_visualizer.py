@@ -1,10 +1,20 @@
 # src/interactor/scripts/terminal_visualizer_simple.py
-import time, shutil
+"""
+Live band visualizer in the terminal. Bands come from a SpectrumWorker over the captured
+input, or, when the track playing has a fresh precomputed cache (scripts/build_viz_cache),
+are replayed from it by the audio clock:
+
+    python -m src.interactor.scripts.terminal_visualizer --viz "ALBUM/disc1_track01.viz" --source "ALBUM/01. X.flac"
+"""
+import argparse, shutil, time
 import numpy as np
 
 from ..core.config import Settings
+from ..audio.clock import AudioClock
+from ..audio.fft import backend_report
 from ..audio.input import RealTimeAudioCapture
-from ..audio.processing import AudioProcessor
+from ..audio.processing import AudioProcessor, spectrum_source
+from ..audio.vizcache import cached_viz
 
 def draw_line(bands: np.ndarray, rms: float) -> None:
     cols = shutil.get_terminal_size((100, 30)).columns
@@ -16,23 +26,51 @@ def draw_line(bands: np.ndarray, rms: float) -> None:
     print(f"\rRMS:{rms:6.3f} | {bars:<{cols-14}}", end="", flush=True)
 
 def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--viz", help="precomputed .viz cache of the track being played")
+    ap.add_argument("--source", help="the track's audio file, to check the cache is up to date")
+    ap.add_argument("--start", type=float, default=0.0, help="track position (s) when capture starts")
+    ap.add_argument("--fps", type=float, default=60.0, help="most redraws per second")
+    args = ap.parse_args()
+
     s = Settings(audio_device_index=27)
     proc = AudioProcessor(s)
 
     print("Starting audio capture (Ctrl+C to stop)")
-    cap = RealTimeAudioCapture(s).start()
+    cap = RealTimeAudioCapture(s)
+    cache = cached_viz(args.viz) if args.viz else None
+    if cache is not None and args.source and not cache.is_fresh(args.source):
+        print("Visualization cache is stale, analysing live")
+        cache = None
+    clock = AudioClock(cap)
+    # Cached frames by clock position when usable, else smoothed 0..1 bands computed off this thread
+    worker = spectrum_source(cap, s, n_bands=cache.n_bands if cache else 32, cache=cache, clock=clock)
+    print(f"Bands from {args.viz}" if cache else backend_report())
+    cap.start()
+    clock.lock_to(args.start)
+
+    # Reused every frame, nothing allocated in the loop
+    audio = np.zeros(s.buffer_size, dtype=np.float32)
+    bands = np.zeros(worker.n_bands, dtype=np.float32)
+    seq = 0
+    frame_s = 1.0 / max(args.fps, 1.0)
+    next_draw = time.monotonic()
     try:
         while True:
-            # latest N samples (N = s.buffer_size)
-            audio = cap.get_audio_data()
+            # Sleep until the worker publishes a new frame rather than polling
+            worker.wait_for_new(seq, timeout=0.5)
+            # Frames come every hop (~190/s at 256 @ 48 kHz), more than a terminal can show:
+            # hold off until the next redraw slot, then take whatever is latest by then
+            delay = next_draw - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            seq = worker.read_bands_into(bands)
 
-            # quick metrics
-            rms = proc.calculate_rms(audio)
-            mags = proc.calculate_fft_visualization(audio)   # 0..1 per rFFT bin
-            bands = proc.group_frequencies(mags, num_bands=32)  # 0..1 per band
+            # latest N samples (N = s.buffer_size) for the level meter
+            rms = proc.calculate_rms(cap.get_audio_data(out=audio))
 
             draw_line(bands, rms)
-            time.sleep(0.05)  # ~20 FPS
+            next_draw = time.monotonic() + frame_s
     except KeyboardInterrupt:
         print("\nStopping…")
     finally:
@@ -0,0 +1,79 @@
+from PySide6.QtCore import QSortFilterProxyModel, QModelIndex
+from .album_list_model import PAGE_SIZE, Roles
+from ...media.service import MediaService
+
+class AlbumFilterModel(QSortFilterProxyModel):
+    """
+    Filters the library grid down to albums matching a type-ahead query. Matching is done
+    by the service's SearchIndex; this only checks each row's album_id against the hits.
+
+    Hits in pages the grid hasn't fetched yet are pulled in a page at a time through
+    fetchMore() while a query is active (AlbumListModel.add_extra), instead of paging through
+    the whole library, and are dropped again when the query changes.
+    """
+    def __init__(self, media_service: MediaService, parent=None):
+        super().__init__(parent)
+        self.service = media_service
+        self._query = ""
+        self._hits: set[str] | None = None  # None = no filter
+        self._unfetched: list[str] = []  # hit ids, in index order, not yet offered to the source
+
+    @property
+    def query(self) -> str:
+        return self._query
+
+    def set_query(self, text: str):
+        self.beginFilterChange()
+        self._query = text.strip()
+        self._hits = set(self.service.search_albums(self._query)) if self._query else None
+        self._unfetched = sorted(self._hits, reverse=True) if self._hits else []
+        self.endFilterChange()
+
+        source = self.sourceModel()
+        if source is None:
+            return
+        # Rows pulled in for the previous query go, so only this query's scrolled-to hits stay
+        source.drop_extra()
+        if self._hits:
+            # First page of hits right away, the view asks for more as it scrolls
+            self.fetchMore(QModelIndex())
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        if self._hits is None:
+            return super().canFetchMore(parent)
+        return not parent.isValid() and bool(self._unfetched)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        if self._hits is None:
+            super().fetchMore(parent)
+            return
+        # Hits already shown are skipped by the source, keep going until a page adds rows
+        while self._unfetched and not parent.isValid():
+            page = self._unfetched[-PAGE_SIZE:]
+            del self._unfetched[-PAGE_SIZE:]
+            if self.sourceModel().add_extra(page):
+                break
+
+    def refresh(self):
+        """ Re-run the current query, e.g. after the search index was updated. """
+        if self._query:
+            self.set_query(self._query)
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if self._hits is None:
+            return True
+        album_id = self.sourceModel().index(source_row, 0, source_parent).data(Roles.IdRole)
+        return album_id in self._hits
+
+    def album_id_at(self, row: int) -> str | None:
+        return self.index(row, 0).data(Roles.IdRole)
+
+    def prefetch(self, first: int, last: int) -> None:
+        self.sourceModel().prefetch_rows(self._source_rows(first, last))
+
+    def evict_outside(self, first: int, last: int) -> None:
+        self.sourceModel().evict_except(self._source_rows(first, last))
+
+    def _source_rows(self, first: int, last: int) -> list[int]:
+        return [self.mapToSource(self.index(row, 0)).row()
+                for row in range(max(first, 0), min(last, self.rowCount() - 1) + 1)]
@@ -1,10 +1,17 @@
-import json
-from functools import lru_cache
 from pathlib import Path
 
 from PySide6.QtCore import QAbstractListModel, Qt, QModelIndex, QByteArray
-from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtGui import QImage, QPixmap
+from ...media.cache import CacheStats, LRUCache
+from ...media.models import AlbumSummary
 from ...media.service import MediaService
+from ..thumbnails import ThumbnailService
+
+THUMB_HEIGHT = 180
+PAGE_SIZE = 200  # rows per fetchMore(), one index query each
+
+def _pixmap_nbytes(pm: QPixmap) -> int:
+    return pm.width() * pm.height() * max(pm.depth(), 8) // 8
 
 class Roles:
     TitleRole = Qt.UserRole + 1
@@ -12,11 +19,24 @@ class Roles:
     DirRole = Qt.UserRole + 3
 
 class AlbumListModel(QAbstractListModel):
-    def __init__(self, media_service: MediaService, parent=None):
+    def __init__(self, media_service: MediaService, thumbnails: ThumbnailService,
+                 icon_cache_bytes: int = 64 * 1024 * 1024, parent=None):
         super().__init__(parent)
         self.service = media_service
-        self._dirs: list[Path] = []
-        self._icon_cache: dict[Path, QIcon] = {}
+        self.thumbnails = thumbnails
+        self._albums: list[AlbumSummary] = []
+        self._known: set[Path] = set()
+        self._total = 0  # albums in the index, rows up to this can still be fetched
+        self._n_extra = 0  # search hits shown ahead of their page, always the last rows
+        self._rows_by_cover: dict[str, list[int]] = {}
+        # Decoded thumbnails by cover path, bounded by pixel bytes rather than library size
+        self._icon_cache: LRUCache[str, QPixmap] = LRUCache(max_bytes=icon_cache_bytes, sizeof=_pixmap_nbytes)
+        self._placeholder = thumbnails.placeholder(THUMB_HEIGHT)
+
+        self.prefetched = 0  # thumbnails requested ahead of being painted
+        self.evicted_offscreen = 0  # dropped for being far from the viewport
+
+        thumbnails.thumbnailReady.connect(self._on_thumbnail)
 
     def roleNames(self):
         return {
@@ -27,60 +47,156 @@ class AlbumListModel(QAbstractListModel):
         }
 
     def rowCount(self, parent=QModelIndex()):
-        return 0 if parent.isValid() else len(self._dirs)
+        return 0 if parent.isValid() else len(self._albums)
 
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid():
             return None
 
-        album_dir = self._dirs[index.row()]
-        meta = _peek_album_meta(album_dir)
+        album = self._albums[index.row()]
 
         if role == Qt.DecorationRole:
-            cover = _find_cover(album_dir)
-            if cover:
-                icon = self._icon_cache.get(cover)
-                if icon is None:
-                    pm = QPixmap(cover)
-                    pm = pm.scaledToHeight(180, Qt.SmoothTransformation)
-                    icon = QIcon(pm)
-                    self._icon_cache[cover] = icon
-                return icon
-            return None
+            if not album.cover:
+                return None
+            pm = self._icon_cache.get(str(album.cover))
+            if pm is None:
+                # Decoded off-thread, _on_thumbnail repaints the row when it's ready
+                self.thumbnails.request(album.cover, THUMB_HEIGHT)
+                return self._placeholder
+            return pm
 
         if role in (Qt.DisplayRole, Roles.TitleRole):
-            return meta.get("album_title") or album_dir.name
+            return album.album_title
         if role == Roles.IdRole:
-            return meta.get("album_id")
+            return album.album_id
         if role == Roles.DirRole:
-            return str(album_dir)
+            return str(album.album_dir)
 
         return None
 
     def load(self):
+        """
+        Start over from the index. Rows are then pulled in pages through fetchMore() as the
+        view scrolls, so a large library shows up at once and only scrolled-through rows are held.
+        """
         self.beginResetModel()
-        self._dirs = self.service.list_albums()
+        self._total = self.service.album_count()
+        self._albums = []
+        self._known = set()
+        self._rows_by_cover = {}
+        self._n_extra = 0
         self.endResetModel()
 
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._albums) - self._n_extra < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        self.drop_extra()
+        after = self._albums[-1] if self._albums else None
+        page = [a for a in self.service.summaries_page(after, PAGE_SIZE) if a.album_dir not in self._known]
+        if not page:
+            self._total = len(self._albums)  # index shrank under us
+            return
+        self._insert(page)
+
+    def append_albums(self, albums: list[AlbumSummary]):
+        """
+        Add albums streamed in by a LibraryLoader, skipping ones already shown. Only used while
+        the index starts out empty; otherwise rows come in pages and sync() picks up changes.
+        """
+        if self._total:
+            return
+        self.drop_extra()
+        new = [a for a in albums if a.album_dir not in self._known]
+        if new:
+            self._insert(new)
+
+    def add_extra(self, album_ids: list[str]) -> int:
+        """
+        Show these albums now, ahead of the page they belong to (search hits the grid hasn't
+        scrolled to). Returns how many rows were added; drop_extra() takes them out again.
+        """
+        new = [a for a in self.service.summaries_for(album_ids) if a.album_dir not in self._known]
+        if new:
+            self._insert(new)
+            self._n_extra += len(new)
+        return len(new)
+
+    def drop_extra(self):
+        """ Remove the rows add_extra() put in, so paging carries on in index order. """
+        if not self._n_extra:
+            return
+        first = len(self._albums) - self._n_extra
+        self.beginRemoveRows(QModelIndex(), first, len(self._albums) - 1)
+        for a in self._albums[first:]:
+            self._known.discard(a.album_dir)
+        del self._albums[first:]
+        for key, rows in list(self._rows_by_cover.items()):
+            rows[:] = [r for r in rows if r < first]
+            if not rows:
+                del self._rows_by_cover[key]
+        self._n_extra = 0
+        self.endRemoveRows()
+
+    def _insert(self, albums: list[AlbumSummary]):
+        first = len(self._albums)
+        self.beginInsertRows(QModelIndex(), first, first + len(albums) - 1)
+        self._albums.extend(albums)
+        self._known.update(a.album_dir for a in albums)
+        for row, a in enumerate(albums, first):
+            self._index_cover(row, a)
+        self.endInsertRows()
+
+    def sync(self, reload: bool = False):
+        """
+        Once a scan is done: settle into the usual paged, sorted order if anything changed.
+        `reload` forces it, for when album.json files changed or albums went away.
+        """
+        if reload or self._total != self.service.album_count():
+            self.load()
+
+    def _index_cover(self, row: int, album: AlbumSummary):
+        if album.cover:
+            self._rows_by_cover.setdefault(str(album.cover), []).append(row)
+
+    def _on_thumbnail(self, path: str, height: int, img: QImage):
+        rows = self._rows_by_cover.get(path)
+        if height != THUMB_HEIGHT or not rows:
+            return
+        self._icon_cache.put(path, QPixmap.fromImage(img))
+        for row in rows:
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx, [Qt.DecorationRole])
+
+    def prefetch(self, first: int, last: int) -> None:
+        """ Queue thumbnails for rows [first, last] that aren't cached yet (rows about to scroll in). """
+        self.prefetch_rows(range(max(first, 0), min(last, len(self._albums) - 1) + 1))
+
+    def evict_outside(self, first: int, last: int) -> None:
+        """ Drop cached thumbnails of every row outside [first, last]. """
+        self.evict_except(range(max(first, 0), min(last, len(self._albums) - 1) + 1))
+
+    def prefetch_rows(self, rows) -> None:
+        for row in rows:
+            cover = self._albums[row].cover
+            if cover and str(cover) not in self._icon_cache:
+                self.thumbnails.request(cover, THUMB_HEIGHT)
+                self.prefetched += 1
+
+    def evict_except(self, rows) -> None:
+        keep = {str(self._albums[row].cover) for row in rows if self._albums[row].cover}
+        for key in self._icon_cache.keys():
+            if key not in keep:
+                self._icon_cache.pop(key)
+                self.evicted_offscreen += 1
+
+    def icon_cache_stats(self) -> CacheStats:
+        """ Hits / misses / LRU evictions and bytes of the thumbnail cache. """
+        return self._icon_cache.stats()
+
     def album_id_at(self, row: int) -> str | None:
-        if 0 <= row < len(self._dirs):
-            return _peek_album_meta(self._dirs[row].get("album_id"))
+        if 0 <= row < len(self._albums):
+            return self._albums[row].album_id
         return None
-
-@lru_cache(maxsize=512)
-def _peek_album_meta(album_dir: Path) -> dict:
-    """ Cached read of a few fields from album.json. """
-    try:
-        data = json.loads((album_dir / "album.json").read_text(encoding="utf-8"))
-        return {
-            "album_id": data.get("album_id"),
-            "album_title": data.get("album_title") or data.get("album") or album_dir.name,
-        }
-    except Exception:
-        return {"album_id": None, "album_title": album_dir.name}
-
-def _find_cover(album_dir: Path) -> Path | None:
-    path = album_dir / "cover.jpg"
-    if path.exists():
-        return path
-    return None
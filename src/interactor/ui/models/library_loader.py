@@ -0,0 +1,41 @@
+import time
+
+from PySide6.QtCore import QThread, Signal
+from ...media.models import AlbumSummary
+from ...media.service import MediaService
+
+class LibraryLoader(QThread):
+    """
+    Runs MediaService.refresh_index() off the UI thread and hands the albums it finds back
+    in small batches, so the library grid fills in while the scan is still running.
+    Then brings the search index up to date.
+    """
+    albumsFound = Signal(list) # list[AlbumSummary]
+    loaded = Signal(object) # RefreshStats
+    searchReady = Signal() # search index caught up with the refresh
+
+    def __init__(self, media_service: MediaService, batch_size: int = 32, batch_interval_s: float = 0.1, parent=None):
+        super().__init__(parent)
+        self.service = media_service
+        self.batch_size = batch_size
+        self.batch_interval_s = batch_interval_s
+
+    def run(self):
+        batch: list[AlbumSummary] = []
+        last = time.monotonic()
+
+        def found(summary: AlbumSummary):
+            nonlocal batch, last
+            batch.append(summary)
+            now = time.monotonic()
+            if len(batch) >= self.batch_size or now - last >= self.batch_interval_s:
+                self.albumsFound.emit(batch)
+                batch, last = [], now
+
+        stats = self.service.refresh_index(on_album=found)
+        if batch:
+            self.albumsFound.emit(batch)
+        self.loaded.emit(stats)
+
+        self.service.refresh_search()
+        self.searchReady.emit()
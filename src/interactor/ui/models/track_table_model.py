@@ -8,7 +8,7 @@ class TrackTableModel(QAbstractTableModel):
     def __init__(self, settings, parent=None):
         super().__init__(parent)
         self.settings = settings
-        self.service = MediaService(settings)
+        self.service = MediaService.shared(settings)
         self._tracks = []
         self._album_id = ""
 
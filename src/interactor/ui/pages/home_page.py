@@ -1,9 +1,12 @@
-from PySide6.QtCore import Signal, Qt
+from PySide6.QtCore import Signal, Qt, QCoreApplication
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListView, QSplitter
+from ..models.album_filter_model import AlbumFilterModel
 from ..models.album_list_model import AlbumListModel
+from ..models.library_loader import LibraryLoader
 from ..widgets.hero_widget import HeroWidget
 from ..widgets.library_widget import LibraryWidget
 from ...media.service import MediaService
+from ..thumbnails import ThumbnailService
 
 
 class HomePage(QWidget):
@@ -12,7 +15,8 @@ class HomePage(QWidget):
     def __init__(self, settings, parent=None):
         super().__init__(parent)
         self.settings = settings
-        self.media = MediaService(settings)
+        # Start from the persisted index and let the loader catch up in the background
+        self.media = MediaService.shared(settings, refresh=False)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
@@ -32,14 +36,33 @@ class HomePage(QWidget):
         splitter.setOpaqueResize(False)
         splitter.setSizes([600, 400])
 
-        self.model = AlbumListModel(self.media)
-        self.library.set_model(self.model)
+        self.thumbnails = ThumbnailService.shared(settings)
+        self.model = AlbumListModel(self.media, self.thumbnails, settings.icon_cache_bytes)
+        self.filter = AlbumFilterModel(self.media)
+        self.filter.setSourceModel(self.model)
+        self.library.set_model(self.filter)
+        self.library.search_changed.connect(self.filter.set_query)
         self.model.load()
 
+        self.loader = LibraryLoader(self.media, parent=self)
+        self.loader.albumsFound.connect(self.model.append_albums)
+        self.loader.loaded.connect(self._on_library_loaded)
+        self.loader.searchReady.connect(self.filter.refresh)
+        self.loader.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.loader.wait)
+            app.aboutToQuit.connect(self.thumbnails.wait)
+
         self.hero.open_album_requested.connect(self.open_album_requested)
         self.library.album_activated.connect(self.open_album_requested)
 
+    def _on_library_loaded(self, stats):
+        self.model.sync(reload=stats.parsed > 0 or stats.removed > 0)
+        if self.hero.current_id is None:
+            self.hero.refresh_random()
+
     def _open_selected(self, idx):
-        album_id = self.model.album_id_at(idx.row())
+        album_id = self.filter.album_id_at(idx.row())
         if album_id:
             self.open_album_requested.emit(album_id)
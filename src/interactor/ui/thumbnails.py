@@ -0,0 +1,187 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QRunnable, QSize, QThreadPool, Qt, Signal
+from PySide6.QtGui import QColor, QImage, QImageReader, QPixmap
+
+class ThumbnailService(QObject):
+    """
+    Decodes covers at the size they are shown, off the UI thread. QImageReader.setScaledSize
+    lets the JPEG decoder skip most of the full-size image. Results are also written under
+    `cache_dir/thumbs`, keyed by source path, mtime, size and target height, so later runs
+    just read the small file back.
+
+    `request()` never blocks: it queues a job and the image arrives via `thumbnailReady`
+    (on the UI thread, as a QImage; turn it into a QPixmap/QIcon there).
+
+    The disk cache is kept under `max_disk_bytes` (0 = unbounded): disk hits bump a file's
+    mtime, and when a write pushes the total over the budget the least recently used files
+    are deleted down to 90% of it.
+    """
+    thumbnailReady = Signal(str, int, QImage) # source path, height, image
+
+    _shared: dict[Path, "ThumbnailService"] = {}
+
+    def __init__(self, cache_dir: str | Path, max_threads: int = 4, max_disk_bytes: int = 0, parent=None):
+        super().__init__(parent)
+        self.cache_dir = Path(cache_dir) / "thumbs"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_disk_bytes = int(max_disk_bytes)
+        self._disk_bytes: int | None = None  # measured by the first worker that writes
+        self._trimming = False
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._pending: set[tuple[str, int]] = set()
+        self._lock = threading.Lock()
+        self._placeholders: dict[int, QPixmap] = {}
+
+        # Bumped from pool threads, under _lock
+        self.decoded = 0  # thumbnails scaled from the source image
+        self.disk_hits = 0  # thumbnails read back from the disk cache
+        self.disk_evictions = 0  # cache files deleted to stay under max_disk_bytes
+
+    @classmethod
+    def shared(cls, settings) -> "ThumbnailService":
+        """ One service (and worker pool) per cache directory. Call from the UI thread. """
+        key = Path(settings.cache_dir)
+        service = cls._shared.get(key)
+        if service is None:
+            service = cls(key, max_disk_bytes=settings.thumb_cache_bytes)
+            cls._shared[key] = service
+        return service
+
+    def request(self, path: str | Path, height: int) -> None:
+        """ Queue a thumbnail of `path` scaled to `height` px, unless one is already on its way. """
+        key = (str(path), int(height))
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._pool.start(_ThumbJob(self, *key))
+
+    def placeholder(self, height: int) -> QPixmap:
+        """ Neutral square shown until the real thumbnail arrives. """
+        pm = self._placeholders.get(height)
+        if pm is None:
+            pm = QPixmap(height, height)
+            pm.fill(QColor(40, 40, 40))
+            self._placeholders[height] = pm
+        return pm
+
+    def wait(self, msecs: int = -1) -> bool:
+        """ Block until queued jobs are done (shutdown, scripts). """
+        return self._pool.waitForDone(msecs)
+
+    def cache_path(self, path: str, height: int) -> Path | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = f"{path}|{st.st_mtime_ns}|{st.st_size}|{height}".encode("utf-8")
+        return self.cache_dir / f"{hashlib.sha1(key).hexdigest()}.jpg"
+
+    def _load(self, path: str, height: int) -> QImage:
+        cached = self.cache_path(path, height)
+        if cached is None:
+            return QImage()
+
+        if cached.exists():
+            img = QImageReader(str(cached)).read()
+            if not img.isNull():
+                with self._lock:
+                    self.disk_hits += 1
+                try:
+                    os.utime(cached)  # recency for the disk budget
+                except OSError:
+                    pass
+                return img
+
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid() and size.height() > height:
+            reader.setScaledSize(QSize(max(1, round(size.width() * height / size.height())), height))
+        img = reader.read()
+        if img.isNull():
+            return img
+        if img.height() != height:
+            # Source smaller than asked for, or a format without scaled decoding
+            img = img.scaledToHeight(height, Qt.SmoothTransformation)
+        with self._lock:
+            self.decoded += 1
+
+        tmp = cached.with_name(f"{cached.stem}.{threading.get_ident()}.tmp.jpg")
+        if img.save(str(tmp), "JPG", 90):
+            os.replace(tmp, cached)
+            self._account_write(cached)
+        return img
+
+    def _account_write(self, path: Path) -> None:
+        if not self.max_disk_bytes:
+            return
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += size
+            if self._trimming or (self._disk_bytes is not None and self._disk_bytes <= self.max_disk_bytes):
+                return
+            self._trimming = True
+        try:
+            self._trim()
+        finally:
+            with self._lock:
+                self._trimming = False
+
+    def _trim(self) -> None:
+        """ Re-measure the disk cache and delete least recently used files down to 90% of the budget. """
+        files = []
+        with os.scandir(self.cache_dir) as it:
+            for e in it:
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime_ns, st.st_size, e.path))
+        total = sum(f[1] for f in files)
+        evicted = 0
+        if total > self.max_disk_bytes:
+            target = self.max_disk_bytes * 9 // 10
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._disk_bytes = total
+            self.disk_evictions += evicted
+
+    def _finish(self, path: str, height: int, img: QImage) -> None:
+        with self._lock:
+            self._pending.discard((path, height))
+        if not img.isNull():
+            self.thumbnailReady.emit(path, height, img)
+
+class _ThumbJob(QRunnable):
+    def __init__(self, service: ThumbnailService, path: str, height: int):
+        super().__init__()
+        self.service = service
+        self.path = path
+        self.height = height
+
+    def run(self):
+        try:
+            img = self.service._load(self.path, self.height)
+        except Exception:
+            img = QImage()
+        # Emitted from the pool thread, Qt queues it over to the UI thread's receivers
+        self.service._finish(self.path, self.height, img)
@@ -1,17 +1,22 @@
-import random
 from PySide6.QtCore import Signal, Qt
-from PySide6.QtGui import QPixmap, QIcon
+from PySide6.QtGui import QImage, QPixmap, QIcon
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout
 
 from ...media.service import MediaService
+from ..thumbnails import ThumbnailService
+
+COVER_HEIGHT = 320
 
 class HeroWidget(QWidget):
     open_album_requested = Signal(str)
 
     def __init__(self, settings, parent=None):
         super().__init__(parent)
-        self.service = MediaService(settings)
+        self.service = MediaService.shared(settings)
+        self.thumbnails = ThumbnailService.shared(settings)
+        self.thumbnails.thumbnailReady.connect(self._on_thumbnail)
         self._current_id: str | None = None
+        self._cover: str | None = None
 
         row = QHBoxLayout(self)
         row.setContentsMargins(0, 0, 0, 0)
@@ -40,28 +45,37 @@ class HeroWidget(QWidget):
 
     def refresh_random(self):
         """ Pick a random album_id """
-        album_ids = list(self.service.get_id_to_dir_keys())
-        if not album_ids:
+        album_id = self.service.random_album_id()
+        if not album_id:
             self.title.setText("No Albums Found!")
-            self.cover.clear()
-            self._current_id = None
+            self.open_button.setIcon(QIcon())
+            self._current_id = self._cover = None
             return
 
-        self._current_id = random.choice(album_ids)
-        album = self.service.get_album(self._current_id)
+        self._current_id = album_id
+        album = self.service.get_summary(self._current_id)
         if not album:
             return
 
         self.title.setText(album.album_title)
 
         path = self.service.cover_path(self._current_id)
+        self._cover = str(path) if path else None
+        self._set_cover(self.thumbnails.placeholder(COVER_HEIGHT))
         if path:
-            pm = QPixmap(str(path))
-            if not pm.isNull():
-                pm = pm.scaledToHeight(320, Qt.SmoothTransformation)
-                icon = QIcon(pm)
-                self.open_button.setIcon(icon)
-                self.open_button.setIconSize(pm.size())
+            self.thumbnails.request(path, COVER_HEIGHT)
+
+    def _on_thumbnail(self, path: str, height: int, img: QImage):
+        if path == self._cover and height == COVER_HEIGHT:
+            self._set_cover(QPixmap.fromImage(img))
+
+    def _set_cover(self, pm: QPixmap):
+        self.open_button.setIcon(QIcon(pm))
+        self.open_button.setIconSize(pm.size())
+
+    @property
+    def current_id(self) -> str | None:
+        return self._current_id
 
     def mousePressEvent(self, event):
         self._emit_open()
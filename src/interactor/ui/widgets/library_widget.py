@@ -1,9 +1,10 @@
-from PySide6.QtCore import Qt, Signal, QSize
+from PySide6.QtCore import Qt, Signal, QSize, QPoint, QTimer
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QScroller, QListView
 from PySide6.QtGui import QResizeEvent
 
 class LibraryWidget(QWidget):
     album_activated = Signal(str)
+    search_changed = Signal(str)
 
     def __init__(self, title="Library", parent=None):
         super().__init__(parent)
@@ -16,6 +17,12 @@ class LibraryWidget(QWidget):
         self.title.setProperty("h2", True)
         view.addWidget(self.title, 0, Qt.AlignLeft)
 
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Search albums, tracks, artists...")
+        self.search.setClearButtonEnabled(True)
+        self.search.textChanged.connect(self.search_changed)
+        view.addWidget(self.search)
+
         self.view = QListView()
         self.view.setViewMode(QListView.IconMode)
         self.view.setFlow(QListView.LeftToRight)
@@ -44,8 +51,55 @@ class LibraryWidget(QWidget):
 
         self._update_grid_size()
 
+        # Settle the thumbnail cache around the viewport shortly after scrolling stops
+        self._viewport_timer = QTimer(self)
+        self._viewport_timer.setSingleShot(True)
+        self._viewport_timer.setInterval(60)
+        self._viewport_timer.timeout.connect(self._update_viewport_cache)
+        self.view.verticalScrollBar().valueChanged.connect(self._schedule_viewport_update)
+
     def set_model(self, model):
         self.view.setModel(model)
+        model.rowsInserted.connect(self._schedule_viewport_update)
+        model.modelReset.connect(self._schedule_viewport_update)
+
+    def visible_rows(self) -> tuple[int, int] | None:
+        """ First and last row currently on screen, if any. """
+        model = self.view.model()
+        if model is None or model.rowCount() == 0:
+            return None
+        rect = self.view.viewport().rect()
+        grid = self.view.gridSize()
+        cols = max(1, rect.width() // grid.width())
+
+        # Probe down from the top edge / up from the bottom edge, spacing between tiles has no index
+        first = last = -1
+        for dy in range(0, grid.height(), 4):
+            if first < 0:
+                first = self.view.indexAt(QPoint(grid.width() // 2, rect.top() + dy)).row()
+            if last < 0:
+                last = self.view.indexAt(QPoint(cols * grid.width() - grid.width() // 2, rect.bottom() - dy)).row()
+        first = max(first, 0)
+        if last < first:
+            # Partial last line (or past the end), walk back to the last tile shown
+            last = model.rowCount() - 1
+            while last > first and not rect.intersects(self.view.visualRect(model.index(last, 0))):
+                last -= 1
+        return first, last
+
+    def _schedule_viewport_update(self, *_):
+        self._viewport_timer.start()
+
+    def _update_viewport_cache(self):
+        model = self.view.model()
+        visible = self.visible_rows()
+        if visible is None or not hasattr(model, "prefetch"):
+            return
+        first, last = visible
+        screen = last - first + 1
+        # One screen ahead in either direction, keep three screens' worth around
+        model.prefetch(first - screen, last + screen)
+        model.evict_outside(first - 3 * screen, last + 3 * screen)
 
     def _emit_selection(self, index):
         album_id = index.data(Qt.UserRole + 2) # Id Role
@@ -57,6 +111,7 @@ class LibraryWidget(QWidget):
     def resizeEvent(self, event: QResizeEvent):
         super().resizeEvent(event)
         self._update_grid_size()
+        self._viewport_timer.start()
 
     def _update_grid_size(self):
         self.view.setIconSize(QSize(self._tileW, self._tileW))